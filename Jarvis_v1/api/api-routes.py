@@ -1,164 +1,166 @@
-from typing import Dict, List, Any, Optional
-from fastapi import APIRouter, HTTPException, Body, Depends
-from pydantic import BaseModel, Field
-
+import orjson
+from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Request, Response
+from loguru import logger
+
+from api.responses import FastJSONResponse, status_response
+from api.schemas import (
+    CommandRequest, CommandResponse, ScheduleRequest, ScheduleResponse, JobInfo,
+    decode_body, request_body_doc, response_doc
+)
 from core.command_processor import CommandProcessor
 from core.task_scheduler import TaskScheduler
-from config.settings import settings
-
-
-# Define API models
-class CommandRequest(BaseModel):
-    command: str = Field(..., description="Command text to process")
-
-
-class CommandResponse(BaseModel):
-    response: str = Field(..., description="Response from command processor")
-
-
-class ScheduleRequest(BaseModel):
-    job_id: str = Field(..., description="Unique job identifier")
-    command: str = Field(..., description="Command to execute")
-    schedule: str = Field(..., description="Schedule in natural language")
-
-
-class ScheduleResponse(BaseModel):
-    success: bool = Field(..., description="Success status")
-    message: str = Field(..., description="Status message")
-
-
-class JobInfo(BaseModel):
-    id: str = Field(..., description="Job identifier")
-    next_run_time: Optional[str] = Field(None, description="Next run time")
-    trigger: Dict[str, Any] = Field(..., description="Trigger information")
+from config.settings import settings, list_audio_devices, audio_devices_etag
 
 
 # Create routers
+# Services are read from app.state (app.state.command_processor and
+# app.state.task_scheduler), which the server populates at startup
 command_router = APIRouter(prefix="/command", tags=["Commands"])
 schedule_router = APIRouter(prefix="/schedule", tags=["Scheduling"])
 system_router = APIRouter(prefix="/system", tags=["System"])
 
+# Prebuilt replies for expected misses; returned directly instead of raising
+_COMMAND_PROCESSOR_UNAVAILABLE = FastJSONResponse(
+    {"detail": "Command processor not available"}, status_code=503
+)
+_TASK_SCHEDULER_UNAVAILABLE = FastJSONResponse(
+    {"detail": "Task scheduler not available"}, status_code=503
+)
+
+# Settings are fixed for the life of the process, so the status body is too
+_SYSTEM_STATUS_RESPONSE = Response(
+    orjson.dumps({
+        "status": "running",
+        "version": "1.0.0",
+        "debug": settings.general.debug
+    }),
+    media_type="application/json"
+)
+
 
 # Command routes
-@command_router.post("/", response_model=CommandResponse)
-async def process_command(
-    request: CommandRequest,
-    command_processor: CommandProcessor = Depends(lambda: None)
-):
+@command_router.post(
+    "",
+    responses=response_doc(CommandResponse),
+    openapi_extra=request_body_doc(CommandRequest)
+)
+async def process_command(request: Request):
     """
     Process a voice command.
     
     Args:
-        request: Command request
-        command_processor: Command processor dependency
+        request: Request with a CommandRequest JSON body
         
     Returns:
         Command response
     """
+    command_processor: Optional[CommandProcessor] = getattr(
+        request.app.state, "command_processor", None
+    )
     if not command_processor:
-        raise HTTPException(status_code=503, detail="Command processor not available")
+        return _COMMAND_PROCESSOR_UNAVAILABLE
         
+    body = await decode_body(request, CommandRequest)
+    
     try:
-        response = command_processor.process_command(request.command)
-        return CommandResponse(response=response)
+        response = await command_processor.aprocess_command(body.command)
+        return FastJSONResponse({"response": response})
     except Exception as e:
+        logger.error("Error processing command: {}", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
 # Schedule routes
-@schedule_router.post("/", response_model=ScheduleResponse)
-async def create_schedule(
-    request: ScheduleRequest,
-    task_scheduler: TaskScheduler = Depends(lambda: None)
-):
+@schedule_router.post(
+    "/",
+    responses=response_doc(ScheduleResponse),
+    openapi_extra=request_body_doc(ScheduleRequest)
+)
+async def create_schedule(request: Request):
     """
     Create a scheduled task.
     
     Args:
-        request: Schedule request
-        task_scheduler: Task scheduler dependency
+        request: Request with a ScheduleRequest JSON body
         
     Returns:
         Schedule response
     """
+    task_scheduler: Optional[TaskScheduler] = getattr(
+        request.app.state, "task_scheduler", None
+    )
     if not task_scheduler:
-        raise HTTPException(status_code=503, detail="Task scheduler not available")
+        return _TASK_SCHEDULER_UNAVAILABLE
         
+    body = await decode_body(request, ScheduleRequest)
+    
     try:
         success = task_scheduler.parse_natural_language_schedule(
-            request.job_id,
-            request.command,
-            request.schedule
+            body.job_id,
+            body.command,
+            body.schedule
         )
         
         if success:
-            return ScheduleResponse(
-                success=True,
-                message=f"Successfully scheduled task {request.job_id}"
-            )
+            return status_response(True, f"Successfully scheduled task {body.job_id}")
         else:
-            return ScheduleResponse(
-                success=False,
-                message=f"Failed to schedule task {request.job_id}"
-            )
+            return status_response(False, f"Failed to schedule task {body.job_id}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@schedule_router.get("/", response_model=List[JobInfo])
-async def list_schedules(
-    task_scheduler: TaskScheduler = Depends(lambda: None)
-):
+@schedule_router.get("/", responses=response_doc(List[JobInfo]))
+async def list_schedules(request: Request):
     """
     List all scheduled tasks.
     
     Args:
-        task_scheduler: Task scheduler dependency
+        request: Incoming request
         
     Returns:
         List of job information
     """
+    task_scheduler: Optional[TaskScheduler] = getattr(
+        request.app.state, "task_scheduler", None
+    )
     if not task_scheduler:
-        raise HTTPException(status_code=503, detail="Task scheduler not available")
+        return _TASK_SCHEDULER_UNAVAILABLE
         
     try:
+        # Job dicts come from our own scheduler, so they are serialized as-is
+        # instead of being validated against JobInfo per job
         jobs = task_scheduler.get_jobs()
-        return jobs
+        return FastJSONResponse(jobs)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@schedule_router.delete("/{job_id}", response_model=ScheduleResponse)
-async def delete_schedule(
-    job_id: str,
-    task_scheduler: TaskScheduler = Depends(lambda: None)
-):
+@schedule_router.delete("/{job_id}", responses=response_doc(ScheduleResponse))
+async def delete_schedule(job_id: str, request: Request):
     """
     Delete a scheduled task.
     
     Args:
         job_id: Job identifier
-        task_scheduler: Task scheduler dependency
+        request: Incoming request
         
     Returns:
         Schedule response
     """
+    task_scheduler: Optional[TaskScheduler] = getattr(
+        request.app.state, "task_scheduler", None
+    )
     if not task_scheduler:
-        raise HTTPException(status_code=503, detail="Task scheduler not available")
+        return _TASK_SCHEDULER_UNAVAILABLE
         
     try:
         success = task_scheduler.remove_job(job_id)
         
         if success:
-            return ScheduleResponse(
-                success=True,
-                message=f"Successfully removed task {job_id}"
-            )
+            return status_response(True, f"Successfully removed task {job_id}")
         else:
-            return ScheduleResponse(
-                success=False,
-                message=f"Failed to remove task {job_id}"
-            )
+            return status_response(False, f"Failed to remove task {job_id}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -172,8 +174,30 @@ async def get_system_status():
     Returns:
         System status information
     """
-    return {
-        "status": "running",
-        "version": "1.0.0",
-        "debug": settings.general.debug
-    }
+    return _SYSTEM_STATUS_RESPONSE
+
+
+@system_router.get("/audio-devices")
+def get_audio_devices(request: Request):
+    """
+    List available audio devices.
+    
+    Supports If-None-Match so clients polling the device list get a 304
+    while it is unchanged.
+    
+    Args:
+        request: Incoming request
+        
+    Returns:
+        List of audio device information
+    """
+    try:
+        devices = list_audio_devices()
+        etag = f'"{audio_devices_etag()}"'
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+        
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+        
+    return FastJSONResponse(devices, headers={"ETag": etag})
@@ -1,38 +1,19 @@
 import threading
 import uvicorn
-from typing import Dict, List, Any, Optional, Callable
-from fastapi import FastAPI, HTTPException, Body, Depends
-from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
+import orjson
+from fastapi import FastAPI, Response
 from loguru import logger
 
+from api.middleware import FastCORS, PathDispatcher
+from api.responses import FastJSONResponse
+from api.routes import command_router, schedule_router, system_router
 from config.settings import settings
 
-
-# API models
-class CommandRequest(BaseModel):
-    command: str = Field(..., description="Command text to process")
-
-
-class CommandResponse(BaseModel):
-    response: str = Field(..., description="Response from command processor")
-
-
-class ScheduleRequest(BaseModel):
-    job_id: str = Field(..., description="Unique job identifier")
-    command: str = Field(..., description="Command to execute")
-    schedule: str = Field(..., description="Schedule in natural language")
-
-
-class ScheduleResponse(BaseModel):
-    success: bool = Field(..., description="Success status")
-    message: str = Field(..., description="Status message")
-
-
-class JobInfo(BaseModel):
-    id: str = Field(..., description="Job identifier")
-    next_run_time: Optional[str] = Field(None, description="Next run time")
-    trigger: Dict[str, Any] = Field(..., description="Trigger information")
+# Constant replies, serialized once and returned as-is on every request
+_ROOT_RESPONSE = Response(
+    orjson.dumps({"message": "Local AI Assistant API"}), media_type="application/json"
+)
+_HEALTH_RESPONSE = Response(orjson.dumps({"status": "ok"}), media_type="application/json")
 
 
 class APIServer:
@@ -42,67 +23,93 @@ class APIServer:
     """
     
     def __init__(self):
-        self.app = FastAPI(title="Local AI Assistant API", version="1.0.0")
+        self.app = FastAPI(
+            title="Local AI Assistant API",
+            version="1.0.0",
+            default_response_class=FastJSONResponse
+        )
+        # Minimal app serving only /command, kept free of main-app middleware
+        self.cmd_app = FastAPI(
+            default_response_class=FastJSONResponse,
+            docs_url=None,
+            redoc_url=None,
+            openapi_url=None
+        )
         self.host = settings.general.host
         self.port = settings.general.port
-        self.command_callback = None
         self.server = None
+        self.server_thread = None
         self.running = False
         
         # Set up CORS
-        self.app.add_middleware(
-            CORSMiddleware,
-            allow_origins=["*"],
-            allow_credentials=True,
-            allow_methods=["*"],
-            allow_headers=["*"],
-        )
+        self.app.add_middleware(FastCORS)
+        self.cmd_app.add_middleware(FastCORS)
         
         # Register routes
         self._setup_routes()
         
-    def set_command_callback(self, callback: Callable[[str], str]):
+        # ASGI entry point: /command goes straight to cmd_app
+        self.asgi_app = PathDispatcher(self.app, {"/command": self.cmd_app})
+        
+        # Build the OpenAPI schema now rather than on the first docs request
+        self.app.openapi()
+        
+    def set_services(self, command_processor=None, task_scheduler=None):
         """
-        Set callback function for processing commands.
+        Expose services to route handlers through app.state.
         
         Args:
-            callback: Function to call with command text
+            command_processor: Command processor used by command routes
+            task_scheduler: Task scheduler used by schedule routes
         """
-        self.command_callback = callback
+        for app in (self.app, self.cmd_app):
+            app.state.command_processor = command_processor
+            app.state.task_scheduler = task_scheduler
         
     def _setup_routes(self):
         """Set up API routes."""
         
         @self.app.get("/")
         async def root():
-            return {"message": "Local AI Assistant API"}
+            return _ROOT_RESPONSE
             
         @self.app.get("/health")
         async def health():
-            return {"status": "ok"}
+            return _HEALTH_RESPONSE
             
-        @self.app.post("/command", response_model=CommandResponse)
-        async def process_command(request: CommandRequest):
-            if not self.command_callback:
-                raise HTTPException(status_code=503, detail="Command processor not available")
-                
-            try:
-                response = self.command_callback(request.command)
-                return CommandResponse(response=response)
-            except Exception as e:
-                logger.error(f"Error processing command: {e}")
-                raise HTTPException(status_code=500, detail=str(e))
-                
-        # Additional routes will be added for task scheduling, configuration, etc.
+        # /command is served by cmd_app. The main app includes the router too so
+        # the endpoint stays in its OpenAPI schema and /docs; PathDispatcher
+        # sends every /command request to cmd_app, so that copy never runs
+        self.cmd_app.include_router(command_router)
+        self.app.include_router(command_router)
+        self.app.include_router(schedule_router)
+        self.app.include_router(system_router)
+        
+    def _create_server(self) -> uvicorn.Server:
+        """Create the uvicorn server for the ASGI app."""
+        # "auto" picks uvloop and httptools when they're installed (uvloop
+        # isn't available on Windows); a single worker is used because the
+        # routers call the in-process services set on app.state
+        config = uvicorn.Config(
+            self.asgi_app,
+            host=self.host,
+            port=self.port,
+            loop="auto",
+            http="auto",
+            log_level="warning",
+            access_log=False
+        )
+        return uvicorn.Server(config)
         
     def start(self):
-        """Start the API server."""
+        """Start the API server in a background thread."""
         if self.running:
             logger.warning("API server is already running")
             return
             
         try:
-            # Create and start server in a separate thread
+            # The server owns its event loop inside this single thread
+            self.server = self._create_server()
             self.server_thread = threading.Thread(target=self._run_server)
             self.server_thread.daemon = True
             self.server_thread.start()
@@ -116,14 +123,10 @@ class APIServer:
     def _run_server(self):
         """Run the uvicorn server."""
         try:
-            uvicorn.run(
-                self.app,
-                host=self.host,
-                port=self.port,
-                log_level="info"
-            )
+            self.server.run()
         except Exception as e:
             logger.error(f"Error in API server: {e}")
+        finally:
             self.running = False
             
     def stop(self):
@@ -134,5 +137,10 @@ class APIServer:
             
         logger.info("Stopping API server")
         self.running = False
-        # Note: There's no clean way to stop uvicorn programmatically
-        # This will be handled by the MCP terminating the thread
+        
+        # uvicorn finishes in-flight requests and exits its serve loop
+        if self.server:
+            self.server.should_exit = True
+            
+        if self.server_thread and self.server_thread.is_alive():
+            self.server_thread.join(timeout=5.0)
@@ -0,0 +1,108 @@
+from typing import Any, Awaitable, Callable, Dict, List, MutableMapping, Optional, Tuple
+
+Scope = MutableMapping[str, Any]
+Message = MutableMapping[str, Any]
+Receive = Callable[[], Awaitable[Message]]
+Send = Callable[[Message], Awaitable[None]]
+ASGIApp = Callable[[Scope, Receive, Send], Awaitable[None]]
+
+Headers = List[Tuple[bytes, bytes]]
+
+
+class FastCORS:
+    """
+    Pure ASGI CORS middleware allowing any origin, method and header.
+    Equivalent to CORSMiddleware(allow_origins=["*"], allow_credentials=True,
+    allow_methods=["*"], allow_headers=["*"]) without per-request Request/Response
+    wrappers: preflights are answered directly and simple requests only get
+    headers appended to the outgoing response start message.
+    """
+
+    ALLOW_METHODS = b"DELETE, GET, HEAD, OPTIONS, PATCH, POST, PUT"
+    MAX_AGE = b"600"
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+        # Header tuples shared by every response, built once
+        self._simple_headers: Headers = [
+            (b"access-control-allow-credentials", b"true"),
+            (b"vary", b"Origin"),
+        ]
+        self._preflight_headers: Headers = self._simple_headers + [
+            (b"access-control-allow-methods", self.ALLOW_METHODS),
+            (b"access-control-max-age", self.MAX_AGE),
+            (b"content-length", b"2"),
+            (b"content-type", b"text/plain; charset=utf-8"),
+        ]
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        origin: Optional[bytes] = None
+        request_method: Optional[bytes] = None
+        request_headers: Optional[bytes] = None
+        for name, value in scope["headers"]:
+            if name == b"origin":
+                origin = value
+            elif name == b"access-control-request-method":
+                request_method = value
+            elif name == b"access-control-request-headers":
+                request_headers = value
+
+        if origin is None:
+            await self.app(scope, receive, send)
+            return
+
+        # Credentials are allowed, so the request origin is echoed instead of "*"
+        origin_header = (b"access-control-allow-origin", origin)
+
+        if scope["method"] == "OPTIONS" and request_method is not None:
+            headers = [origin_header, *self._preflight_headers]
+            if request_headers:
+                headers.append((b"access-control-allow-headers", request_headers))
+            await send({"type": "http.response.start", "status": 200, "headers": headers})
+            await send({"type": "http.response.body", "body": b"OK"})
+            return
+
+        simple_headers = self._simple_headers
+
+        async def send_with_cors(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [
+                    *message.get("headers", ()),
+                    origin_header,
+                    *simple_headers,
+                ]
+            await send(message)
+
+        await self.app(scope, receive, send_with_cors)
+
+
+class PathDispatcher:
+    """
+    Pure ASGI dispatcher that hands selected HTTP paths to dedicated apps.
+    Requests for those paths never enter the main app, so middleware and
+    routing added to the main app stay off the hot path.
+    """
+
+    def __init__(self, app: ASGIApp, routes: Dict[str, ASGIApp]):
+        self.app = app
+
+        # Accept each path with and without a trailing slash
+        self.routes: Dict[str, ASGIApp] = {}
+        for path, target in routes.items():
+            path = path.rstrip("/")
+            self.routes[path] = target
+            self.routes[path + "/"] = target
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            target = self.routes.get(scope["path"])
+            if target is not None:
+                await target(scope, receive, send)
+                return
+
+        await self.app(scope, receive, send)
@@ -0,0 +1,64 @@
+from datetime import timedelta
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from fastapi.responses import ORJSONResponse, Response
+
+
+def orjson_default(obj: Any) -> Any:
+    """
+    Fallback serializer for types orjson does not handle natively.
+
+    orjson already encodes datetime, date, time, UUID, enums and dataclasses,
+    so this only needs to cover the remaining types we hand to responses.
+
+    Args:
+        obj: Object orjson could not serialize
+
+    Returns:
+        JSON-compatible representation of the object
+    """
+    if isinstance(obj, timedelta):
+        return obj.total_seconds()
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    return str(obj)
+
+
+class FastJSONResponse(ORJSONResponse):
+    """
+    ORJSONResponse that also serializes non-native types via orjson_default.
+    Returned directly from endpoints to bypass FastAPI's jsonable_encoder.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content,
+            default=orjson_default,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        )
+
+
+# Constant prefixes for {"success": ..., "message": ...} status bodies
+_SUCCESS_PREFIX = b'{"success":true,"message":'
+_FAILURE_PREFIX = b'{"success":false,"message":'
+
+
+def status_response(success: bool, message: str) -> Response:
+    """
+    Build a {"success": ..., "message": ...} JSON response.
+
+    Only the message is encoded per call; the rest of the body is constant.
+
+    Args:
+        success: Success status
+        message: Status message
+
+    Returns:
+        JSON response
+    """
+    prefix = _SUCCESS_PREFIX if success else _FAILURE_PREFIX
+    return Response(prefix + orjson.dumps(message) + b"}", media_type="application/json")
@@ -0,0 +1,102 @@
+from typing import Any, Dict, Optional, Type, TypeVar
+
+import msgspec
+from fastapi import HTTPException, Request
+
+T = TypeVar("T")
+
+
+# API models
+class CommandRequest(msgspec.Struct, gc=False):
+    """Command text to process."""
+    command: str
+
+
+class CommandResponse(msgspec.Struct, gc=False):
+    """Response from command processor."""
+    response: str
+
+
+class ScheduleRequest(msgspec.Struct, gc=False):
+    """Schedule a command using a natural language schedule."""
+    job_id: str
+    command: str
+    schedule: str
+
+
+class ScheduleResponse(msgspec.Struct, gc=False):
+    """Success status and status message."""
+    success: bool
+    message: str
+
+
+class JobInfo(msgspec.Struct, gc=False):
+    """Scheduled job identifier, next run time and trigger information."""
+    id: str
+    trigger: Dict[str, Any]
+    next_run_time: Optional[str] = None
+
+
+# JSON decoders compiled once per request model and reused for every request
+_decoders: Dict[Any, msgspec.json.Decoder] = {
+    model: msgspec.json.Decoder(model) for model in (CommandRequest, ScheduleRequest)
+}
+
+
+def _decoder(model: Any) -> msgspec.json.Decoder:
+    """Get the cached decoder for a model, compiling it on first use."""
+    decoder = _decoders.get(model)
+    if decoder is None:
+        decoder = _decoders[model] = msgspec.json.Decoder(model)
+    return decoder
+
+
+async def decode_body(request: Request, model: Type[T]) -> T:
+    """
+    Decode and validate a JSON request body with msgspec.
+
+    Args:
+        request: Incoming request
+        model: Struct type to decode into
+
+    Returns:
+        Decoded request model
+    """
+    try:
+        return _decoder(model).decode(await request.body())
+    except msgspec.ValidationError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except msgspec.DecodeError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid JSON body: {e}")
+
+
+def _schema(model: Any) -> Dict[str, Any]:
+    """Build an inline JSON schema for a model (or List[model]) for OpenAPI docs."""
+    (schema,), components = msgspec.json.schema_components(
+        [model], ref_template="{name}"
+    )
+    if "$ref" in schema:
+        return components[schema["$ref"]]
+    if "$ref" in schema.get("items", {}):
+        return {**schema, "items": components[schema["items"]["$ref"]]}
+    return schema
+
+
+def request_body_doc(model: Any) -> Dict[str, Any]:
+    """OpenAPI requestBody for routes that decode their body with decode_body."""
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": _schema(model)}},
+        }
+    }
+
+
+def response_doc(model: Any) -> Dict[int, Dict[str, Any]]:
+    """OpenAPI responses entry documenting a successful JSON response."""
+    return {
+        200: {
+            "description": "Successful Response",
+            "content": {"application/json": {"schema": _schema(model)}},
+        }
+    }
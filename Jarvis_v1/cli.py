@@ -1,24 +1,39 @@
 import os
 import sys
 import time
-import typer
-from typing import Optional
+import signal
+import argparse
+import threading
+from typing import List, Optional
 from loguru import logger
 
-from mcp.controller import MicroservicesControlPlane
-from core.audio_listener import AudioListener
-from core.command_processor import CommandProcessor
 from config.settings import settings, list_audio_devices
 
-# Create Typer app
-app = typer.Typer(help="Local AI Assistant CLI")
+# Heavy service modules (models, integrations, API server) are imported inside
+# the commands that need them so one-shot commands start quickly
 mcp = None
 
 
-@app.command()
+def _wait_for_interrupt():
+    """Block until SIGINT or SIGTERM is received, without polling on POSIX."""
+    stop_event = threading.Event()
+    
+    def handler(sig, frame):
+        stop_event.set()
+        
+    signal.signal(signal.SIGINT, handler)
+    signal.signal(signal.SIGTERM, handler)
+    
+    # Windows only delivers Ctrl+C to a timed wait
+    wait_timeout = None if os.name == "posix" else 1.0
+    while not stop_event.wait(wait_timeout):
+        pass
+
+
 def start():
     """Start the local AI assistant."""
     global mcp
+    from mcp.controller import MicroservicesControlPlane
     
     logger.info("Starting Local AI Assistant...")
     
@@ -35,16 +50,12 @@ def start():
     logger.info("Local AI Assistant started successfully")
     
     # Keep running until interrupted
-    try:
-        while True:
-            time.sleep(1.0)
-    except KeyboardInterrupt:
-        logger.info("Received keyboard interrupt, shutting down...")
-        mcp.stop()
-        logger.info("Local AI Assistant stopped")
+    _wait_for_interrupt()
+    logger.info("Received interrupt, shutting down...")
+    mcp.stop()
+    logger.info("Local AI Assistant stopped")
 
 
-@app.command()
 def stop():
     """Stop the local AI assistant."""
     global mcp
@@ -57,7 +68,6 @@ def stop():
         logger.warning("Local AI Assistant is not running")
 
 
-@app.command()
 def restart():
     """Restart the local AI assistant."""
     stop()
@@ -65,10 +75,10 @@ def restart():
     start()
 
 
-@app.command()
-def command(text: str = typer.Argument(..., help="Command text to process")):
+def command(text: str):
     """Send a command to the assistant."""
     global mcp
+    from mcp.controller import MicroservicesControlPlane
     
     if not mcp or not mcp.running:
         # Initialize MCP if not already running
@@ -79,12 +89,14 @@ def command(text: str = typer.Argument(..., help="Command text to process")):
             
     # Process command
     response = mcp.process_command(text)
-    typer.echo(f"Response: {response}")
+    print(f"Response: {response}")
 
 
-@app.command()
 def listen():
     """Listen for a single voice command."""
+    from core.audio_listener import AudioListener
+    from core.command_processor import CommandProcessor
+    
     # Initialize audio listener
     audio_listener = AudioListener()
     if not audio_listener.initialize():
@@ -110,10 +122,10 @@ def listen():
         logger.warning("No command detected")
         
     # Cleanup
+    command_processor.cleanup()
     audio_listener.cleanup()
 
 
-@app.command()
 def devices():
     """List available audio devices."""
     audio_devices = list_audio_devices()
@@ -122,20 +134,19 @@ def devices():
         logger.warning("No audio devices found")
         return
         
-    typer.echo("Available audio devices:")
+    print("Available audio devices:")
     for device in audio_devices:
-        typer.echo(f"Index: {device['index']}")
-        typer.echo(f"Name: {device['name']}")
-        typer.echo(f"Input channels: {device['input_channels']}")
-        typer.echo(f"Output channels: {device['output_channels']}")
-        typer.echo(f"Default sample rate: {device['default_sample_rate']}")
-        typer.echo("")
+        print(f"Index: {device['index']}")
+        print(f"Name: {device['name']}")
+        print(f"Input channels: {device['input_channels']}")
+        print(f"Output channels: {device['output_channels']}")
+        print(f"Default sample rate: {device['default_sample_rate']}")
+        print("")
         
-    typer.echo(f"Current audio device index: {settings.general.audio_device_index}")
+    print(f"Current audio device index: {settings.general.audio_device_index}")
 
 
-@app.command()
-def test_tts(text: str = typer.Argument(..., help="Text to speak")):
+def test_tts(text: str):
     """Test text-to-speech functionality."""
     from core.tts import TextToSpeech
     
@@ -148,7 +159,6 @@ def test_tts(text: str = typer.Argument(..., help="Text to speak")):
     tts.cleanup()
 
 
-@app.command()
 def test_stt():
     """Test speech-to-text functionality."""
     from core.stt import SpeechToText
@@ -169,7 +179,18 @@ def test_stt():
     stt.cleanup()
 
 
-@app.command()
+def serve_stt(socket_path: Optional[str] = None):
+    """Serve one shared Whisper model to other assistant processes."""
+    from core.stt import SpeechToText
+    
+    stt = SpeechToText()
+    try:
+        if not stt.serve(socket_path):
+            logger.error("Failed to start Whisper server")
+    except KeyboardInterrupt:
+        logger.info("Whisper server stopped")
+
+
 def test_wake_word():
     """Test wake word detection."""
     from core.wake_word import WakeWordDetector
@@ -184,20 +205,69 @@ def test_wake_word():
         
     logger.info("Listening for wake word... (Press Ctrl+C to stop)")
     
+    # Detection loop runs in a worker thread; main thread sleeps until Ctrl+C
+    detector_thread = threading.Thread(target=detector.start, args=(wake_word_callback,))
+    detector_thread.daemon = True
+    detector_thread.start()
+    
     try:
-        detector.start(wake_word_callback)
-        while True:
-            time.sleep(0.1)
-    except KeyboardInterrupt:
+        _wait_for_interrupt()
         logger.info("Stopping wake word detection...")
     finally:
         detector.cleanup()
 
 
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser with one subcommand per CLI command."""
+    parser = argparse.ArgumentParser(description="Local AI Assistant CLI")
+    subparsers = parser.add_subparsers(dest="command_name", metavar="COMMAND")
+    subparsers.required = True
+    
+    def add(name: str, func, help_text: str) -> argparse.ArgumentParser:
+        # Accept both snake_case and dash-separated command names
+        aliases = [name.replace("_", "-")] if "_" in name else []
+        subparser = subparsers.add_parser(name, aliases=aliases, help=help_text)
+        subparser.set_defaults(func=func)
+        return subparser
+        
+    add("start", start, "Start the local AI assistant.")
+    add("stop", stop, "Stop the local AI assistant.")
+    add("restart", restart, "Restart the local AI assistant.")
+    add("command", command, "Send a command to the assistant.").add_argument(
+        "text", help="Command text to process"
+    )
+    add("listen", listen, "Listen for a single voice command.")
+    add("devices", devices, "List available audio devices.")
+    add("test_tts", test_tts, "Test text-to-speech functionality.").add_argument(
+        "text", help="Text to speak"
+    )
+    add("test_stt", test_stt, "Test speech-to-text functionality.")
+    add("test_wake_word", test_wake_word, "Test wake word detection.")
+    add("serve_stt", serve_stt, "Serve a shared Whisper model over a Unix socket.").add_argument(
+        "--socket", dest="socket_path", default=None,
+        help="Socket path, defaults to WHISPER_SERVER_SOCKET"
+    )
+    
+    return parser
+
+
+def main(argv: Optional[List[str]] = None):
+    """
+    Parse command line arguments and run the selected command.
+    
+    Args:
+        argv: Argument list, defaults to sys.argv[1:]
+    """
+    args = vars(_build_parser().parse_args(argv))
+    func = args.pop("func")
+    args.pop("command_name")
+    func(**args)
+
+
 if __name__ == "__main__":
     # Configure logger
     logger.remove()
-    logger.add(sys.stderr, level=settings.general.log_level)
+    logger.add(sys.stderr, level=settings.general.log_level, enqueue=True)
     
-    # Run Typer app
-    app()
+    # Run CLI
+    main()
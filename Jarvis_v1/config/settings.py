@@ -1,101 +1,135 @@
 import os
+import time
 from pathlib import Path
-from typing import Optional, Dict, Any, List
-from pydantic import BaseModel, Field
-from dotenv import load_dotenv
+from dataclasses import dataclass, field
+from typing import Optional, Dict, Any, List, Tuple
 
-# Load environment variables from .env file
-load_dotenv()
+# Load environment variables from .env file once per process tree; child
+# processes inherit the environment and skip the import and disk read
+if not os.getenv("JARVIS_DOTENV_LOADED"):
+    from dotenv import load_dotenv
+    load_dotenv()
+    os.environ["JARVIS_DOTENV_LOADED"] = "1"
 
 # Base project directory
 BASE_DIR = Path(__file__).parent.parent
 
 
-class GeneralSettings(BaseModel):
-    debug: bool = Field(default=os.getenv("DEBUG", "false").lower() == "true")
-    log_level: str = Field(default=os.getenv("LOG_LEVEL", "INFO"))
-    host: str = Field(default=os.getenv("HOST", "0.0.0.0"))
-    port: int = Field(default=int(os.getenv("PORT", "8000")))
-    audio_device_index: int = Field(default=int(os.getenv("AUDIO_DEVICE_INDEX", "0")))
+@dataclass(frozen=True)
+class GeneralSettings:
+    debug: bool = os.getenv("DEBUG", "false").lower() == "true"
+    log_level: str = os.getenv("LOG_LEVEL", "INFO")
+    host: str = os.getenv("HOST", "0.0.0.0")
+    port: int = int(os.getenv("PORT", "8000"))
+    audio_device_index: int = int(os.getenv("AUDIO_DEVICE_INDEX", "0"))
 
 
-class LLMSettings(BaseModel):
-    ollama_host: str = Field(default=os.getenv("OLLAMA_HOST", "http://localhost:11434"))
-    model: str = Field(default=os.getenv("LLM_MODEL", "llama3"))
+@dataclass(frozen=True)
+class LLMSettings:
+    ollama_host: str = os.getenv("OLLAMA_HOST", "http://localhost:11434")
+    model: str = os.getenv("LLM_MODEL", "llama3")
 
 
-class WakeWordSettings(BaseModel):
-    access_key: str = Field(default=os.getenv("PORCUPINE_ACCESS_KEY", ""))
-    wake_word_path: Optional[str] = Field(default=os.getenv("WAKE_WORD_PATH"))
-    sensitivity: float = Field(default=float(os.getenv("WAKE_WORD_SENSITIVITY", "0.5")))
+@dataclass(frozen=True)
+class WakeWordSettings:
+    access_key: str = os.getenv("PORCUPINE_ACCESS_KEY", "")
+    wake_word_path: Optional[str] = os.getenv("WAKE_WORD_PATH")
+    sensitivity: float = float(os.getenv("WAKE_WORD_SENSITIVITY", "0.5"))
 
 
-class STTSettings(BaseModel):
-    model: str = Field(default=os.getenv("WHISPER_MODEL", "base"))
-    language: str = Field(default=os.getenv("WHISPER_LANGUAGE", "en"))
+@dataclass(frozen=True)
+class STTSettings:
+    model: str = os.getenv("WHISPER_MODEL", "base")
+    language: str = os.getenv("WHISPER_LANGUAGE", "en")
+    server_socket: str = os.getenv("WHISPER_SERVER_SOCKET", "")
 
 
-class TTSSettings(BaseModel):
-    model: str = Field(default=os.getenv("TTS_MODEL", "tts_models/en/vctk/vits"))
-    speaker: str = Field(default=os.getenv("TTS_SPEAKER", "p326"))
-    language: str = Field(default=os.getenv("TTS_LANGUAGE", "en"))
+@dataclass(frozen=True)
+class TTSSettings:
+    model: str = os.getenv("TTS_MODEL", "tts_models/en/vctk/vits")
+    speaker: str = os.getenv("TTS_SPEAKER", "p326")
+    language: str = os.getenv("TTS_LANGUAGE", "en")
+    cache_dir: str = os.getenv("TTS_CACHE_DIR", "")
 
 
-class HomeAssistantSettings(BaseModel):
-    url: str = Field(default=os.getenv("HASS_URL", ""))
-    token: str = Field(default=os.getenv("HASS_TOKEN", ""))
+@dataclass(frozen=True)
+class HomeAssistantSettings:
+    url: str = os.getenv("HASS_URL", "")
+    token: str = os.getenv("HASS_TOKEN", "")
 
 
-class MediaSettings(BaseModel):
-    mpd_host: str = Field(default=os.getenv("MPD_HOST", "localhost"))
-    mpd_port: int = Field(default=int(os.getenv("MPD_PORT", "6600")))
-    spotify_client_id: str = Field(default=os.getenv("SPOTIFY_CLIENT_ID", ""))
-    spotify_client_secret: str = Field(default=os.getenv("SPOTIFY_CLIENT_SECRET", ""))
-    spotify_redirect_uri: str = Field(default=os.getenv("SPOTIFY_REDIRECT_URI", ""))
+@dataclass(frozen=True)
+class MediaSettings:
+    mpd_host: str = os.getenv("MPD_HOST", "localhost")
+    mpd_port: int = int(os.getenv("MPD_PORT", "6600"))
+    spotify_client_id: str = os.getenv("SPOTIFY_CLIENT_ID", "")
+    spotify_client_secret: str = os.getenv("SPOTIFY_CLIENT_SECRET", "")
+    spotify_redirect_uri: str = os.getenv("SPOTIFY_REDIRECT_URI", "")
+    spotify_cache_path: str = os.getenv("SPOTIFY_CACHE_PATH", str(BASE_DIR / ".spotify_token_cache"))
 
 
-class SMSSettings(BaseModel):
-    account_sid: str = Field(default=os.getenv("TWILIO_ACCOUNT_SID", ""))
-    auth_token: str = Field(default=os.getenv("TWILIO_AUTH_TOKEN", ""))
-    phone_number: str = Field(default=os.getenv("TWILIO_PHONE_NUMBER", ""))
+@dataclass(frozen=True)
+class SMSSettings:
+    account_sid: str = os.getenv("TWILIO_ACCOUNT_SID", "")
+    auth_token: str = os.getenv("TWILIO_AUTH_TOKEN", "")
+    phone_number: str = os.getenv("TWILIO_PHONE_NUMBER", "")
 
 
-class EmailSettings(BaseModel):
-    smtp_server: str = Field(default=os.getenv("SMTP_SERVER", ""))
-    smtp_port: int = Field(default=int(os.getenv("SMTP_PORT", "587")))
-    username: str = Field(default=os.getenv("SMTP_USERNAME", ""))
-    password: str = Field(default=os.getenv("SMTP_PASSWORD", ""))
-    email_from: str = Field(default=os.getenv("EMAIL_FROM", ""))
+@dataclass(frozen=True)
+class EmailSettings:
+    smtp_server: str = os.getenv("SMTP_SERVER", "")
+    smtp_port: int = int(os.getenv("SMTP_PORT", "587"))
+    username: str = os.getenv("SMTP_USERNAME", "")
+    password: str = os.getenv("SMTP_PASSWORD", "")
+    email_from: str = os.getenv("EMAIL_FROM", "")
 
 
-class TVSettings(BaseModel):
-    tv_type: str = Field(default=os.getenv("TV_TYPE", "webos"))
-    tv_ip: str = Field(default=os.getenv("TV_IP", ""))
-    tv_mac: str = Field(default=os.getenv("TV_MAC", ""))
-    ir_blaster_gpio_pin: int = Field(default=int(os.getenv("IR_BLASTER_GPIO_PIN", "17")))
+@dataclass(frozen=True)
+class TVSettings:
+    tv_type: str = os.getenv("TV_TYPE", "webos")
+    tv_ip: str = os.getenv("TV_IP", "")
+    tv_mac: str = os.getenv("TV_MAC", "")
+    ir_blaster_gpio_pin: int = int(os.getenv("IR_BLASTER_GPIO_PIN", "17"))
 
 
-class Settings(BaseModel):
-    general: GeneralSettings = Field(default_factory=GeneralSettings)
-    llm: LLMSettings = Field(default_factory=LLMSettings)
-    wake_word: WakeWordSettings = Field(default_factory=WakeWordSettings)
-    stt: STTSettings = Field(default_factory=STTSettings)
-    tts: TTSSettings = Field(default_factory=TTSSettings)
-    home_assistant: HomeAssistantSettings = Field(default_factory=HomeAssistantSettings)
-    media: MediaSettings = Field(default_factory=MediaSettings)
-    sms: SMSSettings = Field(default_factory=SMSSettings)
-    email: EmailSettings = Field(default_factory=EmailSettings)
-    tv: TVSettings = Field(default_factory=TVSettings)
+@dataclass(frozen=True)
+class Settings:
+    general: GeneralSettings = field(default_factory=GeneralSettings)
+    llm: LLMSettings = field(default_factory=LLMSettings)
+    wake_word: WakeWordSettings = field(default_factory=WakeWordSettings)
+    stt: STTSettings = field(default_factory=STTSettings)
+    tts: TTSSettings = field(default_factory=TTSSettings)
+    home_assistant: HomeAssistantSettings = field(default_factory=HomeAssistantSettings)
+    media: MediaSettings = field(default_factory=MediaSettings)
+    sms: SMSSettings = field(default_factory=SMSSettings)
+    email: EmailSettings = field(default_factory=EmailSettings)
+    tv: TVSettings = field(default_factory=TVSettings)
 
 
-# Create settings instance
+# Create settings instance once at import; settings are read-only at runtime
 settings = Settings()
 
 
+# Enumerated audio devices as (timestamp, etag, devices); refreshed after the TTL
+AUDIO_DEVICES_TTL = 30.0
+_audio_devices_cache: Optional[Tuple[float, str, List[Dict[str, Any]]]] = None
+
+
 # Helper function to get all audio devices for setup
-def list_audio_devices():
+def list_audio_devices(force_refresh: bool = False) -> List[Dict[str, Any]]:
+    global _audio_devices_cache
+    
+    now = time.monotonic()
+    if (not force_refresh and _audio_devices_cache
+            and now - _audio_devices_cache[0] < AUDIO_DEVICES_TTL):
+        return _audio_devices_cache[2]
+        
+    import hashlib
+    import orjson
     import pyaudio
-    p = pyaudio.PyAudio()
+    from core._portaudio import portaudio_lock
+    with portaudio_lock:
+        p = pyaudio.PyAudio()
     info = []
     
     for i in range(p.get_device_count()):
@@ -108,5 +142,15 @@ def list_audio_devices():
             'default_sample_rate': dev_info['defaultSampleRate'],
         })
     
-    p.terminate()
+    with portaudio_lock:
+        p.terminate()
+    
+    etag = hashlib.blake2b(orjson.dumps(info), digest_size=8).hexdigest()
+    _audio_devices_cache = (now, etag, info)
     return info
+
+
+def audio_devices_etag() -> str:
+    """Stable ETag of the current audio device list, for HTTP conditional requests."""
+    list_audio_devices()
+    return _audio_devices_cache[1]
@@ -0,0 +1,54 @@
+import importlib.util
+
+import numpy as np
+
+# Numba is optional; without it the same helpers run as NumPy expressions
+HAVE_NUMBA = importlib.util.find_spec("numba") is not None
+
+_INV_INT16 = np.float32(1.0 / 32768.0)
+
+
+if HAVE_NUMBA:
+    from numba import njit
+
+    @njit(cache=True, fastmath=True)
+    def int16_to_float32(buf, out):
+        """Scale int16 samples into a float32 buffer in [-1, 1) in a single pass."""
+        inv = np.float32(1.0 / 32768.0)
+        for i in range(buf.shape[0]):
+            out[i] = buf[i] * inv
+        return out
+
+    @njit(cache=True)
+    def chunk_magnitude_sums(buf, chunk, scratch):
+        """Sum |x| over each complete chunk of int16 samples."""
+        count = buf.shape[0] // chunk
+        sums = np.empty(count, dtype=np.int64)
+        for c in range(count):
+            total = 0
+            for i in range(c * chunk, (c + 1) * chunk):
+                v = np.int64(buf[i])
+                total += v if v >= 0 else -v
+            sums[c] = total
+        return sums
+
+else:
+    def int16_to_float32(buf, out):
+        """Scale int16 samples into a float32 buffer in [-1, 1) in a single pass."""
+        return np.multiply(buf, _INV_INT16, out=out)
+
+    def chunk_magnitude_sums(buf, chunk, scratch):
+        """Sum |x| over each complete chunk of int16 samples."""
+        count = buf.shape[0] // chunk
+        size = count * chunk
+
+        # Viewing |x| as uint16 keeps abs(-32768) from wrapping negative
+        magnitude = np.abs(buf[:size], out=scratch[:size])
+        return magnitude.view(np.uint16).reshape(count, chunk).sum(axis=1)
+
+
+def compile_audio_helpers():
+    """Run each helper once so Numba compiles (or loads its cache) up front."""
+    samples = np.zeros(2, dtype=np.int16)
+    int16_to_float32(samples, np.empty(2, dtype=np.float32))
+    chunk_magnitude_sums(samples, 1, np.empty(2, dtype=np.int16))
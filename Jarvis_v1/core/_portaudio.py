@@ -0,0 +1,6 @@
+import threading
+
+# PortAudio's global setup and teardown (Pa_Initialize/Pa_Terminate, run by
+# pyaudio.PyAudio() and PyAudio.terminate()) is not thread-safe, and the audio
+# components initialize on separate threads; hold this lock around both
+portaudio_lock = threading.Lock()
@@ -1,11 +1,20 @@
+import re
+import queue
 import threading
-from typing import Callable, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Optional
 from loguru import logger
 
 from core.wake_word import WakeWordDetector
 from core.stt import SpeechToText
 from core.tts import TextToSpeech
 
+# Whitespace following sentence-ending punctuation
+_SENTENCE_BREAK = re.compile(r"(?<=[.!?])\s+")
+
+# Fixed prompts spoken by the listener, kept in the TTS cache
+_PROMPTS = ("Yes?", "I didn't hear anything", "Listening")
+
 
 class AudioListener:
     """
@@ -25,14 +34,16 @@ class AudioListener:
     def initialize(self) -> bool:
         """Initialize all audio components."""
         try:
-            # Initialize wake word detector
-            self.wake_word_detector.initialize()
-            
-            # Initialize STT
-            self.stt.initialize()
-            
-            # Initialize TTS
-            self.tts.initialize()
+            # Load wake word, STT and TTS models concurrently; loading is mostly
+            # file I/O, so threads overlap the waits. Each component creates its
+            # PyAudio instance under portaudio_lock, so PortAudio is set up serially
+            components = (self.wake_word_detector, self.stt, self.tts)
+            with ThreadPoolExecutor(max_workers=len(components)) as executor:
+                futures = [executor.submit(component.initialize) for component in components]
+                for future in futures:
+                    future.result()
+                    
+            self.tts.precache(_PROMPTS)
             
             logger.info("Audio listener initialized successfully")
             return True
@@ -56,7 +67,7 @@ class AudioListener:
             
             # Process command if not empty
             if command and self.command_callback:
-                logger.info(f"Command received: {command}")
+                logger.info("Command received: {}", command)
                 self.command_callback(command)
             elif not command:
                 logger.info("No command detected")
@@ -126,6 +137,51 @@ class AudioListener:
         """
         return self.tts.speak(text)
         
+    def say_streaming(self, chunks: Iterable[str]) -> str:
+        """
+        Speak streamed text one sentence at a time as it arrives.
+        
+        Complete sentences are handed to a TTS worker thread through a queue,
+        so synthesis and playback overlap with generation of the rest.
+        
+        Args:
+            chunks: Text chunks, e.g. LLM token deltas
+            
+        Returns:
+            Full text that was spoken
+        """
+        sentences = queue.Queue()
+        worker = threading.Thread(
+            target=self.tts.speak_stream,
+            args=(iter(sentences.get, None),),
+            daemon=True
+        )
+        worker.start()
+        
+        parts = []
+        pending = ""
+        
+        try:
+            for chunk in chunks:
+                parts.append(chunk)
+                pending += chunk
+                
+                # Queue every complete sentence and keep the unfinished tail
+                complete = _SENTENCE_BREAK.split(pending)
+                for sentence in complete[:-1]:
+                    if sentence.strip():
+                        sentences.put(sentence.strip())
+                pending = complete[-1]
+                
+            if pending.strip():
+                sentences.put(pending.strip())
+        finally:
+            # Let the worker finish speaking what is queued
+            sentences.put(None)
+            worker.join()
+            
+        return "".join(parts)
+        
     def listen_once(self) -> str:
         """
         Listen for a single voice command and transcribe it.
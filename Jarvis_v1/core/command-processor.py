@@ -1,14 +1,323 @@
 import re
-import json
+import asyncio
 import importlib
-from typing import Dict, List, Any, Optional, Callable, Tuple
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from types import MappingProxyType
+from typing import Dict, List, Any, Optional, Callable, Tuple, Pattern, Match, Literal, Iterable, Set
 from loguru import logger
+from pydantic import BaseModel, Field, ValidationError
 
-from core.llm import LLMService
+from core.llm import LLMService, LLMTimeoutError
 from core.audio_listener import AudioListener
 from integrations.home_assistant import HomeAssistantClient
 from integrations.media_control import MediaController
 
+# System prompt for command parsing; kept constant so the LLM server can reuse
+# its cached prompt prefix across requests
+_SYSTEM_PROMPT = """
+You are an assistant that helps parse voice commands for a home assistant system.
+Extract the intent and parameters from the user's command.
+Return a JSON object with "intent" and "parameters" keys.
+
+Available intents:
+- light_control: Control lights (on/off/brightness/color)
+- climate_control: Control temperature, fans, etc.
+- switch_control: Control switches and outlets
+- device_status: Get status of devices
+- play_music: Play music or audio
+- media_control: Control media playback (pause/resume/next/previous)
+- volume_control: Adjust volume
+- tv_control: Control TV (on/off/channel/input)
+- weather: Get weather information
+- time: Get current time or set timers/alarms
+- general_query: Answer general questions
+- system_control: Control the assistant system
+
+Example formats:
+{"intent": "light_control", "parameters": {"action": "turn_on", "device": "living room lights", "brightness": 80}}
+{"intent": "play_music", "parameters": {"artist": "Taylor Swift", "source": "spotify"}}
+"""
+# System prompt for answering general questions
+_GENERAL_SYSTEM_PROMPT = """
+You are a helpful home assistant AI. Answer the user's question concisely and accurately.
+If you don't know the answer, just say so without making up information.
+Keep responses brief but informative.
+"""
+
+
+class ParsedCommand(BaseModel):
+    """Intent and parameters extracted from a command by the LLM."""
+    intent: Literal[
+        "light_control", "climate_control", "switch_control", "device_status",
+        "play_music", "media_control", "volume_control", "tv_control",
+        "weather", "time", "general_query", "system_control"
+    ] = "general_query"
+    parameters: Dict[str, Any] = Field(default_factory=dict)
+
+
+def _extract_json_object(text: str) -> Optional[str]:
+    """
+    Find the first complete JSON object in text with a single linear scan.
+    
+    Tracks brace depth and string/escape state, so braces inside string
+    values don't end the object early.
+    
+    Args:
+        text: Text that may contain a JSON object
+        
+    Returns:
+        The JSON object substring, or None if there is no complete object
+    """
+    start = text.find("{")
+    if start < 0:
+        return None
+        
+    depth = 0
+    in_string = False
+    escaped = False
+    for i in range(start, len(text)):
+        char = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+                
+    return None
+
+
+# Response when the LLM doesn't answer within its request timeout
+_LLM_TIMEOUT_RESPONSE = "Sorry, the model took too long to respond"
+
+# Fixed spoken responses synthesized into the TTS cache at startup
+_PRECACHED_RESPONSES = (
+    _LLM_TIMEOUT_RESPONSE,
+    "Sorry, I encountered an error while processing your command.",
+    "Sorry, I couldn't answer that question",
+    "I'm not sure what you're asking",
+    "Sorry, I couldn't get the time information",
+    "Sorry, I couldn't get the weather information",
+    "Sorry, I couldn't process that system command",
+    "Home Assistant integration is not available",
+)
+
+
+# Device status formatters keyed by entity domain
+def _format_onoff(name: str, state: str, attributes: Dict[str, Any]) -> str:
+    status = "on" if state == "on" else "off"
+    return f"{name} is {status}"
+
+
+def _format_climate(name: str, state: str, attributes: Dict[str, Any]) -> str:
+    if state == "off":
+        return f"{name} is off"
+    current_temp = attributes.get("current_temperature", "unknown")
+    target_temp = attributes.get("temperature", "unknown")
+    return f"{name} is {state}, current temperature: {current_temp}°, target: {target_temp}°"
+
+
+def _format_sensor(name: str, state: str, attributes: Dict[str, Any]) -> str:
+    unit = attributes.get("unit_of_measurement", "")
+    return f"{name}: {state}{unit}"
+
+
+DOMAIN_FORMATTERS: Dict[str, Callable[[str, str, Dict[str, Any]], str]] = {
+    "light": _format_onoff,
+    "switch": _format_onoff,
+    "climate": _format_climate,
+    "sensor": _format_sensor,
+    "binary_sensor": _format_onoff,
+}
+
+
+# Service attribute builders for _DOMAIN_SPEC
+def _no_attributes(parameters: Dict[str, Any]) -> Dict[str, Any]:
+    return {}
+
+
+def _light_on_attributes(parameters: Dict[str, Any]) -> Dict[str, Any]:
+    # Turn on light with optional brightness/color
+    attributes = {}
+    brightness = parameters.get("brightness")
+    color = parameters.get("color")
+    if brightness is not None:
+        attributes["brightness_pct"] = brightness
+    if color:
+        attributes["color_name"] = color
+    return attributes
+
+
+def _temperature_attributes(parameters: Dict[str, Any]) -> Dict[str, Any]:
+    return {"temperature": parameters["temperature"]}
+
+
+def _hvac_mode_attributes(parameters: Dict[str, Any]) -> Dict[str, Any]:
+    # Set mode (heat, cool, auto, off)
+    return {"hvac_mode": parameters["mode"]}
+
+
+def _hvac_off_attributes(parameters: Dict[str, Any]) -> Dict[str, Any]:
+    return {"hvac_mode": "off"}
+
+
+# Control handlers per Home Assistant domain. Each action maps to
+# (service, required parameters, attribute builder, response template).
+_DOMAIN_SPEC: Dict[str, Dict[str, Any]] = {
+    "light": {
+        "singular": "light",
+        "plural": "lights",
+        "failure": "some of the lights",
+        "actions": {
+            "turn_on": ("turn_on", (), _light_on_attributes, "Turned on {names}"),
+            "turn_off": ("turn_off", (), _no_attributes, "Turned off {names}"),
+            "toggle": ("toggle", (), _no_attributes, "Toggled {names}"),
+        },
+    },
+    "switch": {
+        "singular": "switch",
+        "plural": "switches",
+        "failure": "some of the switches",
+        "actions": {
+            "turn_on": ("turn_on", (), _no_attributes, "Turned on {names}"),
+            "turn_off": ("turn_off", (), _no_attributes, "Turned off {names}"),
+            "toggle": ("toggle", (), _no_attributes, "Toggled {names}"),
+        },
+    },
+    "climate": {
+        "singular": "climate device",
+        "plural": "climate devices",
+        "failure": "the climate devices",
+        "actions": {
+            "set_temperature": (
+                "set_temperature", ("temperature",), _temperature_attributes,
+                "Set temperature to {temperature} degrees for {names}"
+            ),
+            "set_mode": ("set_hvac_mode", ("mode",), _hvac_mode_attributes, "Set {names} to {mode} mode"),
+            "turn_off": ("set_hvac_mode", (), _hvac_off_attributes, "Turned off {names}"),
+        },
+    },
+}
+
+
+# Deterministic fast path for common, unambiguous commands. Patterns are matched
+# against the lower-cased command with surrounding punctuation and a leading
+# "please" removed; anything that doesn't match exactly falls through to the LLM.
+_FAST_PATTERNS: List[Tuple[Pattern, str, Callable[[Match], Dict[str, Any]]]] = [
+    (
+        re.compile(r"(?:turn|switch)\s+(on|off)\s+(?:the\s+)?(?!the\s)(.+?)\s+(?:lights?|lamps?)"),
+        "light_control",
+        lambda m: {"action": f"turn_{m.group(1)}", "device": m.group(2)}
+    ),
+    (
+        re.compile(r"(?:turn|switch)\s+(?:the\s+)?(?!the\s)(.+?)\s+(?:lights?|lamps?)\s+(on|off)"),
+        "light_control",
+        lambda m: {"action": f"turn_{m.group(2)}", "device": m.group(1)}
+    ),
+    (
+        re.compile(r"toggle\s+(?:the\s+)?(?!the\s)(.+?)\s+(?:lights?|lamps?)"),
+        "light_control",
+        lambda m: {"action": "toggle", "device": m.group(1)}
+    ),
+    (
+        re.compile(r"(pause|resume|next|skip|previous)(?:\s+(?:the\s+)?(?:music|song|track|playback))?"),
+        "media_control",
+        lambda m: {"action": m.group(1)}
+    ),
+    (
+        re.compile(r"stop\s+(?:the\s+)?(?:music|song|playback)"),
+        "media_control",
+        lambda m: {"action": "stop"}
+    ),
+    (
+        re.compile(r"(?:turn\s+(?:the\s+)?volume|volume|turn\s+it)\s+(up|down)"),
+        "volume_control",
+        lambda m: {"action": m.group(1)}
+    ),
+    (
+        re.compile(r"(?:set\s+(?:the\s+)?)?volume\s+(?:to\s+)?(\d{1,3})(?:\s*%|\s+percent)?"),
+        "volume_control",
+        lambda m: {"action": "set", "level": min(100, int(m.group(1)))}
+    ),
+    (
+        re.compile(r"(mute|unmute)"),
+        "volume_control",
+        lambda m: {"action": m.group(1)}
+    ),
+    (
+        re.compile(r"what(?:'s|\s+is)\s+the\s+time|what\s+time\s+is\s+it"),
+        "time",
+        lambda m: {"action": "get_time"}
+    ),
+    (
+        re.compile(r"what(?:'s|\s+is)\s+(?:the\s+date|today's\s+date)|what\s+day\s+is\s+(?:it|today)"),
+        "time",
+        lambda m: {"action": "get_date"}
+    ),
+    (
+        re.compile(r"what(?:'s|\s+is)\s+the\s+weather(?:\s+like)?(?:\s+today)?"),
+        "weather",
+        lambda m: {}
+    ),
+]
+
+
+def _match_fast_path(text: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+    """
+    Match a normalized command against the fast-path patterns.
+    
+    Args:
+        text: Lower-cased, whitespace-normalized command text
+        
+    Returns:
+        Tuple containing intent and parameters, or None if no pattern matches
+    """
+    text = text.strip(" .,!?")
+    if text.startswith("please "):
+        text = text[7:]
+        
+    for pattern, intent, build_parameters in _FAST_PATTERNS:
+        match = pattern.fullmatch(text)
+        if match:
+            return intent, build_parameters(match)
+            
+    return None
+
+
+# Response templates per time action; each formats only the fields it speaks
+_TIME_ACTIONS = MappingProxyType({
+    "get_time": "The current time is {:%I:%M %p}",
+    "current_time": "The current time is {:%I:%M %p}",
+    "get_date": "Today is {:%A, %B %d, %Y}",
+    "current_date": "Today is {:%A, %B %d, %Y}",
+    "get_datetime": "It's {:%I:%M %p on %A, %B %d, %Y}",
+    "current_datetime": "It's {:%I:%M %p on %A, %B %d, %Y}",
+})
+
+# System command names per system control action
+_SYSTEM_ACTIONS = MappingProxyType({
+    "stop": "SHUTDOWN",
+    "shutdown": "SHUTDOWN",
+    "exit": "SHUTDOWN",
+    "restart": "RESTART",
+    "mute": "MUTE",
+    "mute_on": "MUTE",
+    "unmute": "UNMUTE",
+    "mute_off": "UNMUTE",
+})
+
 
 class CommandProcessor:
     """
@@ -16,16 +325,55 @@ class CommandProcessor:
     Uses the LLM to understand user intents and routes commands to appropriate integrations.
     """
     
+    __slots__ = (
+        "llm", "audio_listener", "home_assistant", "_media_controller", "_media_init",
+        "handlers", "integrations", "_parse_cache", "_parse_cache_lock",
+        "_service_executor", "_query_batch", "_flush_tasks", "_flush_timer"
+    )
+    
+    # Maximum number of parsed commands kept in the parse cache
+    PARSE_CACHE_SIZE = 512
+    
+    # Entity domains covered by device status queries
+    STATUS_DOMAINS = ("light", "switch", "climate", "sensor", "binary_sensor")
+    
+    # General queries arriving within this many seconds share one LLM request,
+    # up to GENERAL_QUERY_BATCH_SIZE queries per request
+    GENERAL_QUERY_BATCH_WINDOW = 0.05
+    GENERAL_QUERY_BATCH_SIZE = 8
+    
+    # Action aliases accepted by the on/off style handlers
+    _ON_ACTIONS = frozenset({"on", "turn_on"})
+    _OFF_ACTIONS = frozenset({"off", "turn_off"})
+    _TOGGLE_ACTIONS = frozenset({"toggle"})
+    
     def __init__(self):
         self.llm = LLMService()
         self.audio_listener = None
         self.home_assistant = None
-        self.media_controller = None
+        
+        # Media controller and the future of its background initialization
+        self._media_controller = None
+        self._media_init: Optional[Future] = None
         
         # Command handlers keyed by intent
         self.handlers = {}
         self.integrations = {}
         
+        # LRU cache of normalized command text -> (intent, parameters)
+        self._parse_cache: "OrderedDict[str, Tuple[str, Dict[str, Any]]]" = OrderedDict()
+        self._parse_cache_lock = threading.Lock()
+        
+        # Runs per-entity service calls concurrently
+        self._service_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="ha-service")
+        
+        # Pending general queries (query, future) waiting to be batched
+        self._query_batch: List[Tuple[str, asyncio.Future]] = []
+        
+        # Running batch flush tasks, referenced until they finish
+        self._flush_tasks: Set[asyncio.Task] = set()
+        self._flush_timer: Optional[asyncio.TimerHandle] = None
+        
     def initialize(self, audio_listener: Optional[AudioListener] = None) -> bool:
         """
         Initialize the command processor and integrations.
@@ -43,6 +391,15 @@ class CommandProcessor:
             # Register command handlers
             self._register_handlers()
             
+            # Load the model and prefill the general query prompt in the background
+            threading.Thread(
+                target=self.llm.warm_up, args=(_GENERAL_SYSTEM_PROMPT,), daemon=True
+            ).start()
+            
+            # Synthesize the fixed responses once TTS is up
+            if audio_listener:
+                audio_listener.tts.precache(_PRECACHED_RESPONSES)
+                
             logger.info("Command processor initialized successfully")
             return True
             
@@ -53,22 +410,46 @@ class CommandProcessor:
     def _initialize_integrations(self):
         """Initialize integrations."""
         try:
-            # Initialize Home Assistant client
+            # Initialize Media Controller in the background; MPD and Spotify
+            # setup only has to be complete before the first media command
+            media_controller = MediaController()
+            init_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="media-init")
+            self._media_init = init_executor.submit(media_controller.initialize)
+            init_executor.shutdown(wait=False)
+            self._media_controller = media_controller
+            self.integrations["media"] = media_controller
+            
+            # Initialize Home Assistant client while media initializes
             self.home_assistant = HomeAssistantClient()
             self.home_assistant.initialize()
             self.integrations["home_assistant"] = self.home_assistant
             
-            # Initialize Media Controller
-            self.media_controller = MediaController()
-            self.media_controller.initialize()
-            self.integrations["media"] = self.media_controller
-            
             # Initialize other integrations as needed
             # ...
             
         except Exception as e:
             logger.error(f"Error initializing integrations: {e}")
             
+    @property
+    def media_controller(self) -> Optional[MediaController]:
+        """Media controller, waiting for its background initialization on first use."""
+        media_init = self._media_init
+        if media_init is not None:
+            try:
+                media_init.result()
+            except Exception as e:
+                logger.error(f"Error initializing media controller: {e}")
+            self._media_init = None
+            
+        return self._media_controller
+        
+    def cleanup(self):
+        """Release worker threads, LLM and Home Assistant connections."""
+        self._service_executor.shutdown(wait=False)
+        self.llm.close()
+        if self.home_assistant:
+            self.home_assistant.close()
+        
     def _register_handlers(self):
         """Register command handlers for different intents."""
         # Home automation handlers
@@ -103,53 +484,144 @@ class CommandProcessor:
         Returns:
             Tuple containing intent and parameters dictionary
         """
+        key, parsed = self._lookup_parse(command)
+        if parsed is not None:
+            return parsed
+            
         try:
-            # Default system prompt to guide the LLM in parsing commands
-            system_prompt = """
-            You are an assistant that helps parse voice commands for a home assistant system.
-            Extract the intent and parameters from the user's command.
-            Return a JSON object with "intent" and "parameters" keys.
-            
-            Available intents:
-            - light_control: Control lights (on/off/brightness/color)
-            - climate_control: Control temperature, fans, etc.
-            - switch_control: Control switches and outlets
-            - device_status: Get status of devices
-            - play_music: Play music or audio
-            - media_control: Control media playback (pause/resume/next/previous)
-            - volume_control: Adjust volume
-            - tv_control: Control TV (on/off/channel/input)
-            - weather: Get weather information
-            - time: Get current time or set timers/alarms
-            - general_query: Answer general questions
-            - system_control: Control the assistant system
-            
-            Example formats:
-            {"intent": "light_control", "parameters": {"action": "turn_on", "device": "living room lights", "brightness": 80}}
-            {"intent": "play_music", "parameters": {"artist": "Taylor Swift", "source": "spotify"}}
-            """
-            
-            # Prompt for the LLM
-            prompt = f"Parse this voice command: '{command}'\nExtract the intent and parameters as JSON."
-            
-            # Get response from LLM
-            response = self.llm.generate(prompt, system_prompt=system_prompt)
-            
-            # Extract JSON from response
-            json_match = re.search(r'\{.*\}', response, re.DOTALL)
-            if json_match:
-                parsed_json = json.loads(json_match.group(0))
-                intent = parsed_json.get("intent", "general_query")
-                parameters = parsed_json.get("parameters", {})
-                return intent, parameters
-            else:
-                logger.warning(f"Could not extract JSON from LLM response: {response}")
-                return "general_query", {"query": command}
-                
+            # Get response from LLM, constrained to a JSON object
+            response = self.llm.generate(
+                self._parse_prompt(command), system_prompt=_SYSTEM_PROMPT, response_format="json"
+            )
+            return self._finish_parse(key, command, response)
+            
+        except LLMTimeoutError:
+            # A general query would wait on the same stalled model
+            raise
+            
         except Exception as e:
             logger.error(f"Error parsing command: {e}")
             return "general_query", {"query": command}
             
+    async def _aparse_command(self, command: str) -> Tuple[str, Dict[str, Any]]:
+        """
+        Parse a command with the async LLM client so the call doesn't block the loop.
+        
+        Args:
+            command: User command text
+            
+        Returns:
+            Tuple containing intent and parameters dictionary
+        """
+        key, parsed = self._lookup_parse(command)
+        if parsed is not None:
+            return parsed
+            
+        try:
+            response = await self.llm.agenerate(
+                self._parse_prompt(command), system_prompt=_SYSTEM_PROMPT, response_format="json"
+            )
+            return self._finish_parse(key, command, response)
+            
+        except LLMTimeoutError:
+            # A general query would wait on the same stalled model
+            raise
+            
+        except Exception as e:
+            logger.error(f"Error parsing command: {e}")
+            return "general_query", {"query": command}
+            
+    def _lookup_parse(self, command: str) -> Tuple[str, Optional[Tuple[str, Dict[str, Any]]]]:
+        """
+        Resolve a command without the LLM, via the fast path or the parse cache.
+        
+        Args:
+            command: User command text
+            
+        Returns:
+            Tuple of the normalized cache key and the parsed command, or None on a miss
+        """
+        key = " ".join(command.lower().split())
+        
+        # Common commands are resolved locally without an LLM call
+        fast = _match_fast_path(key)
+        if fast is not None:
+            return key, fast
+            
+        # Repeated commands are answered from the cache without an LLM call
+        with self._parse_cache_lock:
+            cached = self._parse_cache.get(key)
+            if cached is not None:
+                self._parse_cache.move_to_end(key)
+                return key, (cached[0], dict(cached[1]))
+                
+        return key, None
+        
+    @staticmethod
+    def _parse_prompt(command: str) -> str:
+        """Build the LLM prompt for parsing a command."""
+        return f"Parse this voice command: '{command}'\nExtract the intent and parameters as JSON."
+        
+    def _finish_parse(self, key: str, command: str, response: str) -> Tuple[str, Dict[str, Any]]:
+        """
+        Validate the LLM parse response and cache the result.
+        
+        Args:
+            key: Normalized command text
+            command: User command text
+            response: Raw LLM response text
+            
+        Returns:
+            Tuple containing intent and parameters dictionary
+        """
+        parsed = self._validate_parsed_command(response)
+        if parsed is not None:
+            self._cache_parse(key, parsed.intent, parsed.parameters)
+            return parsed.intent, parsed.parameters
+        else:
+            logger.warning(f"Could not extract JSON from LLM response: {response}")
+            return "general_query", {"query": command}
+            
+    def _validate_parsed_command(self, response: str) -> Optional[ParsedCommand]:
+        """
+        Validate an LLM parse response against the ParsedCommand model.
+        
+        Args:
+            response: Raw LLM response text
+            
+        Returns:
+            Parsed command, or None if the response is not a valid command
+        """
+        try:
+            return ParsedCommand.model_validate_json(response)
+        except ValidationError:
+            pass
+            
+        # Servers without JSON mode may wrap the object in prose
+        json_text = _extract_json_object(response)
+        if json_text:
+            try:
+                return ParsedCommand.model_validate_json(json_text)
+            except ValidationError:
+                pass
+                
+        return None
+        
+    def _cache_parse(self, key: str, intent: str, parameters: Dict[str, Any]):
+        """
+        Store a parsed command in the LRU parse cache.
+        
+        Args:
+            key: Normalized command text
+            intent: Parsed intent
+            parameters: Parsed parameters
+        """
+        with self._parse_cache_lock:
+            self._parse_cache[key] = (intent, dict(parameters))
+            self._parse_cache.move_to_end(key)
+            if len(self._parse_cache) > self.PARSE_CACHE_SIZE:
+                self._parse_cache.popitem(last=False)
+                
     def process_command(self, command: str) -> str:
         """
         Process a user command, determine intent, and execute appropriate handler.
@@ -165,230 +637,315 @@ class CommandProcessor:
             
             # Parse command to determine intent and parameters
             intent, parameters = self._parse_command(command)
-            logger.info(f"Detected intent: {intent}, parameters: {parameters}")
             
-            # Execute appropriate handler
-            if intent in self.handlers:
-                response = self.handlers[intent](parameters)
-            else:
-                # Fallback to general query
-                response = self._handle_general_query({"query": command})
-                
-            # Speak response if audio listener is available
-            if self.audio_listener:
-                self.audio_listener.say(response)
-                
-            return response
+            return self._execute_intent(command, intent, parameters)
             
         except Exception as e:
-            logger.error(f"Error processing command: {e}")
-            error_msg = "Sorry, I encountered an error while processing your command."
-            
-            if self.audio_listener:
-                self.audio_listener.say(error_msg)
-                
-            return error_msg
+            return self._command_error(e)
             
-    # Command handlers
-    def _handle_light_control(self, parameters: Dict[str, Any]) -> str:
-        """Handle light control commands."""
-        if not self.home_assistant:
-            return "Home Assistant integration is not available"
+    async def aprocess_command(self, command: str) -> str:
+        """
+        Process a user command without blocking the event loop.
+        
+        The LLM parse goes through the async client; the handler and speech
+        output are blocking calls, so they run in the loop's default executor.
+        Concurrent commands overlap their LLM round-trips instead of queueing
+        behind each other, and concurrent general queries share batched LLM
+        requests; their answers are spoken once they arrive.
+        
+        Args:
+            command: User command text
             
+        Returns:
+            Response message
+        """
         try:
-            action = parameters.get("action", "")
-            device = parameters.get("device", "")
-            brightness = parameters.get("brightness")
-            color = parameters.get("color")
+            logger.info(f"Processing command: {command}")
             
-            if not device:
-                return "Please specify which light you want to control"
-                
-            # Find matching light entities
-            lights = self.home_assistant.find_entities("light", device)
-            if not lights:
-                return f"I couldn't find any lights matching '{device}'"
-                
-            results = []
-            for light in lights:
-                if action in ["on", "turn_on"]:
-                    # Turn on light with optional brightness/color
-                    attributes = {}
-                    if brightness is not None:
-                        attributes["brightness_pct"] = brightness
-                    if color:
-                        attributes["color_name"] = color
-                        
-                    success = self.home_assistant.call_service(
-                        "light", "turn_on", 
-                        {"entity_id": light["entity_id"], **attributes}
-                    )
-                    results.append((light["entity_id"], success))
-                    
-                elif action in ["off", "turn_off"]:
-                    # Turn off light
-                    success = self.home_assistant.call_service(
-                        "light", "turn_off", 
-                        {"entity_id": light["entity_id"]}
-                    )
-                    results.append((light["entity_id"], success))
-                    
-                elif action in ["toggle"]:
-                    # Toggle light
-                    success = self.home_assistant.call_service(
-                        "light", "toggle", 
-                        {"entity_id": light["entity_id"]}
-                    )
-                    results.append((light["entity_id"], success))
+            intent, parameters = await self._aparse_command(command)
+            loop = asyncio.get_running_loop()
             
-            # Generate response based on results
-            if all(success for _, success in results):
-                friendly_names = [self.home_assistant.get_entity_name(entity_id) for entity_id, _ in results]
-                names_str = ", ".join(friendly_names[:-1]) + " and " + friendly_names[-1] if len(friendly_names) > 1 else friendly_names[0]
-                
-                if action in ["on", "turn_on"]:
-                    return f"Turned on {names_str}"
-                elif action in ["off", "turn_off"]:
-                    return f"Turned off {names_str}"
-                elif action in ["toggle"]:
-                    return f"Toggled {names_str}"
-            else:
-                return f"I had trouble controlling some of the lights"
+            # Concurrent general queries are batched
+            if intent not in self.handlers:
+                intent, parameters = "general_query", {"query": command}
+            if intent == "general_query" and parameters.get("query"):
+                logger.info(f"Detected intent: {intent}, parameters: {parameters}")
+                response = await self._abatched_general_query(parameters["query"])
                 
-            return "Light control command completed"
+                # Speak response if audio listener is available
+                if self.audio_listener:
+                    await loop.run_in_executor(None, self.audio_listener.say, response)
+                return response
+                
+            return await loop.run_in_executor(
+                None, self._execute_intent, command, intent, parameters
+            )
             
         except Exception as e:
-            logger.error(f"Error handling light control: {e}")
-            return "Sorry, I had trouble controlling the lights"
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, self._command_error, e)
             
-    def _handle_climate_control(self, parameters: Dict[str, Any]) -> str:
-        """Handle climate control commands."""
-        if not self.home_assistant:
-            return "Home Assistant integration is not available"
+    async def aprocess_batch(self, commands: List[str]) -> List[str]:
+        """
+        Process several commands concurrently.
+        
+        Args:
+            commands: User command texts
             
-        try:
-            action = parameters.get("action", "")
-            device = parameters.get("device", "")
-            temperature = parameters.get("temperature")
-            mode = parameters.get("mode")
+        Returns:
+            Response messages in the same order as the commands
+        """
+        return list(await asyncio.gather(*(self.aprocess_command(c) for c in commands)))
+        
+    async def _abatched_general_query(self, query: str) -> str:
+        """
+        Answer a general query, sharing one LLM request with other queries
+        that arrive within GENERAL_QUERY_BATCH_WINDOW.
+        
+        Args:
+            query: User query
             
-            if not device:
-                return "Please specify which climate device you want to control"
-                
-            # Find matching climate entities
-            climate_devices = self.home_assistant.find_entities("climate", device)
-            if not climate_devices:
-                return f"I couldn't find any climate devices matching '{device}'"
-                
-            results = []
-            for climate in climate_devices:
-                if action in ["set_temperature"] and temperature is not None:
-                    # Set temperature
-                    success = self.home_assistant.call_service(
-                        "climate", "set_temperature", 
-                        {"entity_id": climate["entity_id"], "temperature": temperature}
-                    )
-                    results.append((climate["entity_id"], success))
+        Returns:
+            Answer text
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._query_batch.append((query, future))
+        
+        if len(self._query_batch) >= self.GENERAL_QUERY_BATCH_SIZE:
+            self._start_query_flush(loop)
+        elif len(self._query_batch) == 1:
+            self._flush_timer = loop.call_later(self.GENERAL_QUERY_BATCH_WINDOW, self._start_query_flush, loop)
+            
+        return await future
+        
+    def _start_query_flush(self, loop: asyncio.AbstractEventLoop):
+        """Start flushing the pending general queries, keeping the task referenced until it finishes."""
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+            
+        pending, self._query_batch = self._query_batch, []
+        task = loop.create_task(self._aflush_query_batch(pending))
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+        
+    async def _aflush_query_batch(self, pending: List[Tuple[str, asyncio.Future]]):
+        """Answer the given general queries, GENERAL_QUERY_BATCH_SIZE per LLM request."""
+        size = self.GENERAL_QUERY_BATCH_SIZE
+        await asyncio.gather(*(
+            self._aanswer_query_batch(pending[i:i + size]) for i in range(0, len(pending), size)
+        ))
+        
+    async def _aanswer_query_batch(self, batch: List[Tuple[str, asyncio.Future]]):
+        """
+        Answer a batch of general queries with one LLM request.
+        
+        Args:
+            batch: Pending (query, future) pairs
+        """
+        try:
+            loop = asyncio.get_running_loop()
+            answers = await loop.run_in_executor(
+                None, self.llm.generate_batch, [query for query, _ in batch], _GENERAL_SYSTEM_PROMPT, 200
+            )
+            for (_, future), answer in zip(batch, answers):
+                if not future.done():
+                    future.set_result(answer)
                     
-                elif action in ["set_mode"] and mode:
-                    # Set mode (heat, cool, auto, off)
-                    success = self.home_assistant.call_service(
-                        "climate", "set_hvac_mode", 
-                        {"entity_id": climate["entity_id"], "hvac_mode": mode}
-                    )
-                    results.append((climate["entity_id"], success))
+        except Exception as e:
+            logger.error(f"Error handling general query batch: {e}")
+            if isinstance(e, LLMTimeoutError):
+                error_msg = _LLM_TIMEOUT_RESPONSE
+            else:
+                error_msg = "Sorry, I couldn't answer that question"
+            for _, future in batch:
+                if not future.done():
+                    future.set_result(error_msg)
                     
-                elif action in ["off", "turn_off"]:
-                    # Turn off climate device
-                    success = self.home_assistant.call_service(
-                        "climate", "set_hvac_mode", 
-                        {"entity_id": climate["entity_id"], "hvac_mode": "off"}
-                    )
-                    results.append((climate["entity_id"], success))
+    def _execute_intent(self, command: str, intent: str, parameters: Dict[str, Any]) -> str:
+        """
+        Run the handler for a parsed command and speak its response.
+        
+        Args:
+            command: User command text
+            intent: Parsed intent
+            parameters: Parsed parameters
             
-            # Generate response based on results
-            if all(success for _, success in results):
-                friendly_names = [self.home_assistant.get_entity_name(entity_id) for entity_id, _ in results]
-                names_str = ", ".join(friendly_names[:-1]) + " and " + friendly_names[-1] if len(friendly_names) > 1 else friendly_names[0]
-                
-                if action in ["set_temperature"]:
-                    return f"Set temperature to {temperature} degrees for {names_str}"
-                elif action in ["set_mode"]:
-                    return f"Set {names_str} to {mode} mode"
-                elif action in ["off", "turn_off"]:
-                    return f"Turned off {names_str}"
-            else:
-                return f"I had trouble controlling the climate devices"
-                
-            return "Climate control command completed"
+        Returns:
+            Response message
+        """
+        logger.info(f"Detected intent: {intent}, parameters: {parameters}")
+        
+        handler = self.handlers.get(intent)
+        if handler is None:
+            # Fallback to general query
+            intent, parameters = "general_query", {"query": command}
+            handler = self._handle_general_query
             
-        except Exception as e:
-            logger.error(f"Error handling climate control: {e}")
-            return "Sorry, I had trouble controlling the climate devices"
+        # Free-form answers are spoken sentence by sentence as they stream
+        audio_listener = self.audio_listener
+        if intent == "general_query" and audio_listener:
+            return self._handle_general_query_streaming(parameters)
             
-    def _handle_switch_control(self, parameters: Dict[str, Any]) -> str:
-        """Handle switch control commands."""
+        # Execute appropriate handler
+        response = handler(parameters)
+            
+        # Speak response if audio listener is available
+        if audio_listener:
+            audio_listener.say(response)
+            
+        return response
+        
+    def _command_error(self, error: Exception) -> str:
+        """
+        Log a command processing error and speak a generic error message.
+        
+        Args:
+            error: Exception raised while processing the command
+            
+        Returns:
+            Error message
+        """
+        logger.error(f"Error processing command: {error}")
+        if isinstance(error, LLMTimeoutError):
+            error_msg = _LLM_TIMEOUT_RESPONSE
+        else:
+            error_msg = "Sorry, I encountered an error while processing your command."
+        
+        if self.audio_listener:
+            self.audio_listener.say(error_msg)
+            
+        return error_msg
+        
+    # Home Assistant helpers
+    def _resolve_names(self, entity_ids: Iterable[str]) -> List[str]:
+        """
+        Get friendly names for several entities.
+        
+        Args:
+            entity_ids: Entity IDs
+            
+        Returns:
+            Friendly names in the same order
+        """
+        return [self.home_assistant.get_entity_name(entity_id) for entity_id in entity_ids]
+        
+    @staticmethod
+    def _english_join(names: List[str]) -> str:
+        """
+        Join names as an English list, e.g. "a, b and c".
+        
+        Args:
+            names: Names to join
+            
+        Returns:
+            Joined names
+        """
+        if len(names) > 1:
+            return f"{', '.join(names[:-1])} and {names[-1]}"
+        return names[0] if names else ""
+        
+    def _call_services(self, domain: str, service: str, service_data: List[Dict[str, Any]]) -> List[bool]:
+        """
+        Call a Home Assistant service once per payload, concurrently.
+        
+        Args:
+            domain: Service domain
+            service: Service name
+            service_data: Service data for each call
+            
+        Returns:
+            Success status of each call, in payload order
+        """
+        call_service = self.home_assistant.call_service
+        if len(service_data) == 1:
+            return [call_service(domain, service, service_data[0])]
+            
+        return list(self._service_executor.map(
+            lambda data: call_service(domain, service, data), service_data
+        ))
+        
+    # Command handlers
+    def _handle_onoff(self, domain: str, parameters: Dict[str, Any]) -> str:
+        """
+        Handle control commands for a Home Assistant domain using _DOMAIN_SPEC.
+        
+        Args:
+            domain: Entity domain (light, switch, climate)
+            parameters: Command parameters
+            
+        Returns:
+            Response message
+        """
+        spec = _DOMAIN_SPEC[domain]
         if not self.home_assistant:
             return "Home Assistant integration is not available"
             
         try:
-            action = parameters.get("action", "")
-            device = parameters.get("device", "")
+            get = parameters.get
+            action = get("action", "")
+            device = get("device", "")
             
             if not device:
-                return "Please specify which switch you want to control"
-                
-            # Find matching switch entities
-            switches = self.home_assistant.find_entities("switch", device)
-            if not switches:
-                return f"I couldn't find any switches matching '{device}'"
-                
-            results = []
-            for switch in switches:
-                if action in ["on", "turn_on"]:
-                    # Turn on switch
-                    success = self.home_assistant.call_service(
-                        "switch", "turn_on", 
-                        {"entity_id": switch["entity_id"]}
-                    )
-                    results.append((switch["entity_id"], success))
-                    
-                elif action in ["off", "turn_off"]:
-                    # Turn off switch
-                    success = self.home_assistant.call_service(
-                        "switch", "turn_off", 
-                        {"entity_id": switch["entity_id"]}
-                    )
-                    results.append((switch["entity_id"], success))
+                return f"Please specify which {spec['singular']} you want to control"
+                
+            # Find matching entities
+            entities = self.home_assistant.find_entities(domain, device)
+            if not entities:
+                return f"I couldn't find any {spec['plural']} matching '{device}'"
+                
+            if action in self._ON_ACTIONS:
+                action = "turn_on"
+            elif action in self._OFF_ACTIONS:
+                action = "turn_off"
+            elif action in self._TOGGLE_ACTIONS:
+                action = "toggle"
+                
+            action_spec = spec["actions"].get(action)
+            if action_spec is None:
+                return f"Unknown {domain} control action: {action}"
+                
+            service, required, build_attributes, template = action_spec
+            for name in required:
+                if get(name) in (None, ""):
+                    return f"Please specify the {name}"
                     
-                elif action in ["toggle"]:
-                    # Toggle switch
-                    success = self.home_assistant.call_service(
-                        "switch", "toggle", 
-                        {"entity_id": switch["entity_id"]}
-                    )
-                    results.append((switch["entity_id"], success))
-            
+            attributes = build_attributes(parameters)
+            entity_ids = [entity["entity_id"] for entity in entities]
+            successes = self._call_services(
+                domain, service,
+                [{"entity_id": entity_id, **attributes} for entity_id in entity_ids]
+            )
+            
+            ok_ids: List[str] = []
+            fail_ids: List[str] = []
+            for entity_id, success in zip(entity_ids, successes):
+                (ok_ids if success else fail_ids).append(entity_id)
+                
             # Generate response based on results
-            if all(success for _, success in results):
-                friendly_names = [self.home_assistant.get_entity_name(entity_id) for entity_id, _ in results]
-                names_str = ", ".join(friendly_names[:-1]) + " and " + friendly_names[-1] if len(friendly_names) > 1 else friendly_names[0]
-                
-                if action in ["on", "turn_on"]:
-                    return f"Turned on {names_str}"
-                elif action in ["off", "turn_off"]:
-                    return f"Turned off {names_str}"
-                elif action in ["toggle"]:
-                    return f"Toggled {names_str}"
-            else:
-                return f"I had trouble controlling some of the switches"
+            if fail_ids:
+                return f"I had trouble controlling {spec['failure']}"
+                
+            names_str = self._english_join(self._resolve_names(ok_ids))
+            return template.format_map({**parameters, "names": names_str})
                 
-            return "Switch control command completed"
-            
         except Exception as e:
-            logger.error(f"Error handling switch control: {e}")
-            return "Sorry, I had trouble controlling the switches"
+            logger.error(f"Error handling {domain} control: {e}")
+            return f"Sorry, I had trouble controlling the {spec['plural']}"
             
+    def _handle_light_control(self, parameters: Dict[str, Any]) -> str:
+        """Handle light control commands."""
+        return self._handle_onoff("light", parameters)
+        
+    def _handle_climate_control(self, parameters: Dict[str, Any]) -> str:
+        """Handle climate control commands."""
+        return self._handle_onoff("climate", parameters)
+        
+    def _handle_switch_control(self, parameters: Dict[str, Any]) -> str:
+        """Handle switch control commands."""
+        return self._handle_onoff("switch", parameters)
+        
     def _handle_device_status(self, parameters: Dict[str, Any]) -> str:
         """Handle device status queries."""
         if not self.home_assistant:
@@ -400,45 +957,26 @@ class CommandProcessor:
             if not device:
                 return "Please specify which device you want to check"
                 
-            # Try to find the device across different entity types
-            entity_types = ["light", "switch", "climate", "sensor", "binary_sensor"]
-            found_entities = []
-            
-            for entity_type in entity_types:
-                entities = self.home_assistant.find_entities(entity_type, device)
-                found_entities.extend(entities)
+            # Find the device across all status domains in a single pass
+            found_entities = self.home_assistant.find_entities(self.STATUS_DOMAINS, device)
                 
             if not found_entities:
                 return f"I couldn't find any devices matching '{device}'"
                 
-            # Generate status report for found entities
+            # Generate status report for found entities, formatted by domain
             status_lines = []
+            get_formatter = DOMAIN_FORMATTERS.get
+            get_name = self.home_assistant.get_entity_name
+            get_state = self.home_assistant.get_entity_state
+            get_attributes = self.home_assistant.get_entity_attributes
             for entity in found_entities:
                 entity_id = entity["entity_id"]
-                entity_name = self.home_assistant.get_entity_name(entity_id)
-                state = self.home_assistant.get_entity_state(entity_id)
-                
-                if "light." in entity_id or "switch." in entity_id:
-                    status = "on" if state == "on" else "off"
-                    status_lines.append(f"{entity_name} is {status}")
-                    
-                elif "climate." in entity_id:
-                    if state == "off":
-                        status_lines.append(f"{entity_name} is off")
-                    else:
-                        attributes = self.home_assistant.get_entity_attributes(entity_id)
-                        current_temp = attributes.get("current_temperature", "unknown")
-                        target_temp = attributes.get("temperature", "unknown")
-                        status_lines.append(f"{entity_name} is {state}, current temperature: {current_temp}°, target: {target_temp}°")
-                        
-                elif "sensor." in entity_id:
-                    attributes = self.home_assistant.get_entity_attributes(entity_id)
-                    unit = attributes.get("unit_of_measurement", "")
-                    status_lines.append(f"{entity_name}: {state}{unit}")
+                formatter = get_formatter(entity_id.split(".", 1)[0])
+                if formatter is None:
+                    continue
                     
-                elif "binary_sensor." in entity_id:
-                    status = "on" if state == "on" else "off"
-                    status_lines.append(f"{entity_name} is {status}")
+                attributes = get_attributes(entity_id) or {}
+                status_lines.append(formatter(get_name(entity_id), get_state(entity_id), attributes))
             
             if status_lines:
                 return "\n".join(status_lines)
@@ -451,29 +989,31 @@ class CommandProcessor:
             
     def _handle_play_music(self, parameters: Dict[str, Any]) -> str:
         """Handle music playback commands."""
-        if not self.media_controller:
+        media = self.media_controller
+        if not media:
             return "Media controller is not available"
             
         try:
-            source = parameters.get("source", "").lower()
-            artist = parameters.get("artist", "")
-            album = parameters.get("album", "")
-            track = parameters.get("track", "")
-            playlist = parameters.get("playlist", "")
-            genre = parameters.get("genre", "")
+            get = parameters.get
+            source = get("source", "").lower()
+            artist = get("artist", "")
+            album = get("album", "")
+            track = get("track", "")
+            playlist = get("playlist", "")
+            genre = get("genre", "")
             
             # Determine what to play
             if source == "spotify":
                 if artist and track:
-                    result = self.media_controller.play_spotify(artist=artist, track=track)
+                    result = media.play_spotify(artist=artist, track=track)
                 elif artist and album:
-                    result = self.media_controller.play_spotify(artist=artist, album=album)
+                    result = media.play_spotify(artist=artist, album=album)
                 elif artist:
-                    result = self.media_controller.play_spotify(artist=artist)
+                    result = media.play_spotify(artist=artist)
                 elif playlist:
-                    result = self.media_controller.play_spotify(playlist=playlist)
+                    result = media.play_spotify(playlist=playlist)
                 elif genre:
-                    result = self.media_controller.play_spotify(genre=genre)
+                    result = media.play_spotify(genre=genre)
                 else:
                     return "Please specify what you'd like to play on Spotify"
                     
@@ -493,20 +1033,20 @@ class CommandProcessor:
             
             elif source == "mpd" or not source:
                 if artist and track:
-                    result = self.media_controller.play_mpd(artist=artist, title=track)
+                    result = media.play_mpd(artist=artist, title=track)
                 elif artist and album:
-                    result = self.media_controller.play_mpd(artist=artist, album=album)
+                    result = media.play_mpd(artist=artist, album=album)
                 elif artist:
-                    result = self.media_controller.play_mpd(artist=artist)
+                    result = media.play_mpd(artist=artist)
                 elif album:
-                    result = self.media_controller.play_mpd(album=album)
+                    result = media.play_mpd(album=album)
                 elif track:
-                    result = self.media_controller.play_mpd(title=track)
+                    result = media.play_mpd(title=track)
                 elif genre:
-                    result = self.media_controller.play_mpd(genre=genre)
+                    result = media.play_mpd(genre=genre)
                 else:
                     # Just play something
-                    result = self.media_controller.play_mpd()
+                    result = media.play_mpd()
                     
                 if result:
                     if track and artist:
@@ -535,42 +1075,43 @@ class CommandProcessor:
             
     def _handle_media_control(self, parameters: Dict[str, Any]) -> str:
         """Handle media control commands (pause, resume, next, etc.)."""
-        if not self.media_controller:
+        media = self.media_controller
+        if not media:
             return "Media controller is not available"
             
         try:
             action = parameters.get("action", "")
             
             if action in ["pause", "stop"]:
-                result = self.media_controller.pause()
+                result = media.pause()
                 return "Paused" if result else "Failed to pause"
                 
             elif action in ["play", "resume"]:
-                result = self.media_controller.play()
+                result = media.play()
                 return "Resumed playback" if result else "Failed to resume playback"
                 
             elif action in ["next", "skip"]:
-                result = self.media_controller.next()
+                result = media.next()
                 return "Skipped to next track" if result else "Failed to skip to next track"
                 
             elif action in ["previous", "back"]:
-                result = self.media_controller.previous()
+                result = media.previous()
                 return "Went back to previous track" if result else "Failed to go back"
                 
             elif action in ["shuffle", "shuffle_on"]:
-                result = self.media_controller.set_shuffle(True)
+                result = media.set_shuffle(True)
                 return "Shuffle mode enabled" if result else "Failed to enable shuffle mode"
                 
             elif action in ["shuffle_off"]:
-                result = self.media_controller.set_shuffle(False)
+                result = media.set_shuffle(False)
                 return "Shuffle mode disabled" if result else "Failed to disable shuffle mode"
                 
             elif action in ["repeat", "repeat_on"]:
-                result = self.media_controller.set_repeat(True)
+                result = media.set_repeat(True)
                 return "Repeat mode enabled" if result else "Failed to enable repeat mode"
                 
             elif action in ["repeat_off"]:
-                result = self.media_controller.set_repeat(False)
+                result = media.set_repeat(False)
                 return "Repeat mode disabled" if result else "Failed to disable repeat mode"
                 
             else:
@@ -582,7 +1123,8 @@ class CommandProcessor:
             
     def _handle_volume_control(self, parameters: Dict[str, Any]) -> str:
         """Handle volume control commands."""
-        if not self.media_controller:
+        media = self.media_controller
+        if not media:
             return "Media controller is not available"
             
         try:
@@ -591,33 +1133,33 @@ class CommandProcessor:
             step = parameters.get("step", 10)  # Default step is 10%
             
             if action in ["set", "set_volume"] and level is not None:
-                result = self.media_controller.set_volume(level)
+                result = media.set_volume(level)
                 return f"Volume set to {level}%" if result else "Failed to set volume"
                 
             elif action in ["up", "increase"]:
-                current = self.media_controller.get_volume()
+                current = media.get_volume()
                 if current is not None:
                     new_level = min(100, current + step)
-                    result = self.media_controller.set_volume(new_level)
+                    result = media.set_volume(new_level)
                     return f"Volume increased to {new_level}%" if result else "Failed to increase volume"
                 else:
                     return "Failed to get current volume"
                     
             elif action in ["down", "decrease"]:
-                current = self.media_controller.get_volume()
+                current = media.get_volume()
                 if current is not None:
                     new_level = max(0, current - step)
-                    result = self.media_controller.set_volume(new_level)
+                    result = media.set_volume(new_level)
                     return f"Volume decreased to {new_level}%" if result else "Failed to decrease volume"
                 else:
                     return "Failed to get current volume"
                     
             elif action in ["mute", "mute_on"]:
-                result = self.media_controller.set_mute(True)
+                result = media.set_mute(True)
                 return "Muted" if result else "Failed to mute"
                 
             elif action in ["unmute", "mute_off"]:
-                result = self.media_controller.set_mute(False)
+                result = media.set_mute(False)
                 return "Unmuted" if result else "Failed to unmute"
                 
             else:
@@ -664,33 +1206,33 @@ class CommandProcessor:
             wind_bearing = attributes.get("wind_bearing")
             forecast = attributes.get("forecast", [])
             
-            # Build response
-            response = f"Current weather: {state}"
+            # Build response from parts and join once
+            parts = [f"Current weather: {state}"]
             
             if temperature is not None:
-                response += f", temperature: {temperature}°"
+                parts.append(f", temperature: {temperature}°")
                 
             if humidity is not None:
-                response += f", humidity: {humidity}%"
+                parts.append(f", humidity: {humidity}%")
                 
             if wind_speed is not None:
-                response += f", wind: {wind_speed}"
+                parts.append(f", wind: {wind_speed}")
                 
             # Add forecast if available
-            if forecast and len(forecast) > 0:
+            if forecast:
                 tomorrow = forecast[0]
                 temp_low = tomorrow.get("temperature_low")
                 temp_high = tomorrow.get("temperature")
                 condition = tomorrow.get("condition")
                 
-                response += f"\nTomorrow: {condition}"
+                parts.append(f"\nTomorrow: {condition}")
                 
                 if temp_low is not None and temp_high is not None:
-                    response += f", {temp_low}° to {temp_high}°"
+                    parts.append(f", {temp_low}° to {temp_high}°")
                 elif temp_high is not None:
-                    response += f", high of {temp_high}°"
+                    parts.append(f", high of {temp_high}°")
                     
-            return response
+            return "".join(parts)
             
         except Exception as e:
             logger.error(f"Error handling weather query: {e}")
@@ -698,26 +1240,15 @@ class CommandProcessor:
             
     def _handle_time(self, parameters: Dict[str, Any]) -> str:
         """Handle time-related queries."""
-        from datetime import datetime
-        
         try:
             action = parameters.get("action", "get_time")
+            template = _TIME_ACTIONS.get(action)
             
-            if action in ["get_time", "current_time"]:
-                now = datetime.now()
-                return f"The current time is {now.strftime('%I:%M %p')}"
-                
-            elif action in ["get_date", "current_date"]:
-                now = datetime.now()
-                return f"Today is {now.strftime('%A, %B %d, %Y')}"
-                
-            elif action in ["get_datetime", "current_datetime"]:
-                now = datetime.now()
-                return f"It's {now.strftime('%I:%M %p')} on {now.strftime('%A, %B %d, %Y')}"
-                
-            else:
+            if template is None:
                 return f"Unknown time action: {action}"
                 
+            return template.format(datetime.now())
+            
         except Exception as e:
             logger.error(f"Error handling time query: {e}")
             return "Sorry, I couldn't get the time information"
@@ -730,41 +1261,75 @@ class CommandProcessor:
             if not query:
                 return "I'm not sure what you're asking"
                 
-            # Use the LLM to answer general questions
-            system_prompt = """
-            You are a helpful home assistant AI. Answer the user's question concisely and accurately.
-            If you don't know the answer, just say so without making up information.
-            Keep responses brief but informative.
-            """
-            
-            response = self.llm.generate(query, system_prompt=system_prompt, max_tokens=200)
-            return response
+            # Use the LLM to answer general questions; the chat endpoint keeps
+            # the shared system prompt cached between questions
+            response = self.llm.chat(
+                messages=[{"role": "user", "content": query}],
+                system_prompt=_GENERAL_SYSTEM_PROMPT,
+                max_tokens=200
+            )
+            return response.get("message", {}).get("content", "")
+            
+        except LLMTimeoutError:
+            return _LLM_TIMEOUT_RESPONSE
             
         except Exception as e:
             logger.error(f"Error handling general query: {e}")
             return "Sorry, I couldn't answer that question"
             
+    def _handle_general_query_streaming(self, parameters: Dict[str, Any]) -> str:
+        """
+        Answer a general question while speaking it as the LLM streams it.
+        
+        Speech starts after the first sentence instead of after the full answer.
+        
+        Args:
+            parameters: Command parameters with the query
+            
+        Returns:
+            Full answer text
+        """
+        query = parameters.get("query", "")
+        response = ""
+        
+        if query:
+            try:
+                # Same chat endpoint and system prompt as _handle_general_query,
+                # so the cached prompt prefix is shared
+                chunks = self.llm.chat_streaming(
+                    [{"role": "user", "content": query}],
+                    system_prompt=_GENERAL_SYSTEM_PROMPT,
+                    max_tokens=200
+                )
+                response = self.audio_listener.say_streaming(chunks)
+                if response:
+                    return response
+                response = "Sorry, I couldn't answer that question"
+                
+            except LLMTimeoutError:
+                response = _LLM_TIMEOUT_RESPONSE
+                
+            except Exception as e:
+                logger.error(f"Error handling general query: {e}")
+                response = "Sorry, I couldn't answer that question"
+        else:
+            response = "I'm not sure what you're asking"
+            
+        self.audio_listener.say(response)
+        return response
+            
     def _handle_system_control(self, parameters: Dict[str, Any]) -> str:
         """Handle system control commands."""
         try:
             action = parameters.get("action", "")
             
-            if action in ["stop", "shutdown", "exit"]:
-                # This will be handled by the main application
-                return "SYSTEM_COMMAND:SHUTDOWN"
-                
-            elif action in ["restart"]:
-                return "SYSTEM_COMMAND:RESTART"
-                
-            elif action in ["mute", "mute_on"]:
-                return "SYSTEM_COMMAND:MUTE"
-                
-            elif action in ["unmute", "mute_off"]:
-                return "SYSTEM_COMMAND:UNMUTE"
-                
-            else:
+            # Shutdown, restart and mute are handled by the main application
+            command = _SYSTEM_ACTIONS.get(action)
+            if command is None:
                 return f"Unknown system command: {action}"
                 
+            return f"SYSTEM_COMMAND:{command}"
+            
         except Exception as e:
             logger.error(f"Error handling system control: {e}")
             return "Sorry, I couldn't process that system command"
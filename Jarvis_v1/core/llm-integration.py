@@ -1,24 +1,79 @@
-import json
+import time
+import asyncio
+import importlib.util
+import httpx
+import orjson
 import requests
-from typing import Dict, List, Optional, Union, Any
+from requests.adapters import HTTPAdapter
+from typing import AsyncIterator, Dict, List, Optional, Union, Any
 from loguru import logger
 
 from config.settings import settings
 
 
+class LLMTimeoutError(Exception):
+    """Raised when Ollama doesn't respond within the request timeout."""
+
+
 class LLMService:
     """
     LLM service using Ollama for local language model inference.
     """
     
+    # How long Ollama keeps the model and its prompt cache loaded after a chat
+    KEEP_ALIVE = "10m"
+    
+    # (connect, read) timeouts in seconds; reads are long to allow slow generation
+    TIMEOUT = (10.0, 300.0)
+    
+    # Attempts and initial backoff in seconds for idempotent metadata requests
+    RETRY_ATTEMPTS = 3
+    RETRY_BACKOFF = 2.0
+    
     def __init__(self):
         self.model = settings.llm.model
         self.ollama_host = settings.llm.ollama_host
         
+        # Pooled keep-alive connections to Ollama, reused across calls
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=10, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({
+            "Connection": "keep-alive",
+            "Accept-Encoding": "gzip, deflate",
+        })
+        
+        # Async clients for the a* methods, one per event loop they are used in,
+        # created on first use in that loop
+        self._aclients: Dict[asyncio.AbstractEventLoop, httpx.AsyncClient] = {}
+        
+    def _get_with_retry(self, path: str) -> requests.Response:
+        """
+        GET an Ollama endpoint, retrying connection failures and timeouts with
+        exponential backoff. Only used for idempotent requests.
+        
+        Args:
+            path: API path, e.g. "/api/tags"
+            
+        Returns:
+            HTTP response
+        """
+        delay = self.RETRY_BACKOFF
+        for attempt in range(1, self.RETRY_ATTEMPTS + 1):
+            try:
+                return self.session.get(f"{self.ollama_host}{path}", timeout=self.TIMEOUT)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt == self.RETRY_ATTEMPTS:
+                    raise
+                logger.warning(f"Ollama request {path} failed ({e}), retrying in {delay:g}s")
+                time.sleep(delay)
+                delay = min(delay * 2, 10.0)
+                
     def is_available(self) -> bool:
         """Check if Ollama service is available."""
         try:
-            response = requests.get(f"{self.ollama_host}/api/tags")
+            response = self._get_with_retry("/api/tags")
             return response.status_code == 200
         except Exception as e:
             logger.error(f"Error checking Ollama availability: {e}")
@@ -27,9 +82,9 @@ class LLMService:
     def list_models(self) -> List[Dict[str, Any]]:
         """List available models in Ollama."""
         try:
-            response = requests.get(f"{self.ollama_host}/api/tags")
+            response = self._get_with_retry("/api/tags")
             if response.status_code == 200:
-                return response.json().get("models", [])
+                return orjson.loads(response.content).get("models", [])
             else:
                 logger.error(f"Failed to list models: {response.status_code}")
                 return []
@@ -38,7 +93,8 @@ class LLMService:
             return []
             
     def generate(self, prompt: str, system_prompt: Optional[str] = None, 
-                temperature: float = 0.7, max_tokens: Optional[int] = None) -> str:
+                temperature: float = 0.7, max_tokens: Optional[int] = None,
+                response_format: Optional[Union[str, Dict[str, Any]]] = None) -> str:
         """
         Generate text using the configured LLM.
         
@@ -47,6 +103,8 @@ class LLMService:
             system_prompt: Optional system prompt for context
             temperature: Controls randomness (0.0 to 1.0)
             max_tokens: Maximum number of tokens to generate
+            response_format: Optional output constraint passed as Ollama's
+                "format" ("json" or a JSON schema)
             
         Returns:
             Generated text
@@ -68,24 +126,84 @@ class LLMService:
             if max_tokens:
                 payload["options"]["num_predict"] = max_tokens
                 
+            if response_format:
+                payload["format"] = response_format
+                
             # Make request to Ollama API
             logger.info(f"Generating text with model: {self.model}")
-            response = requests.post(
+            response = self.session.post(
                 f"{self.ollama_host}/api/generate", 
-                json=payload
+                json=payload,
+                timeout=self.TIMEOUT
             )
             
             if response.status_code == 200:
-                result = response.json()
+                result = orjson.loads(response.content)
                 return result.get("response", "")
             else:
                 logger.error(f"Failed to generate text: {response.status_code}")
                 return ""
                 
+        except requests.Timeout as e:
+            logger.error(f"Timed out during text generation: {e}")
+            raise LLMTimeoutError(str(e)) from e
+            
         except Exception as e:
             logger.error(f"Error during text generation: {e}")
             return ""
             
+    def generate_batch(self, queries: List[str], system_prompt: Optional[str] = None,
+                       max_tokens: Optional[int] = None) -> List[str]:
+        """
+        Answer several queries with a single chat request.
+        
+        Requests go through chat() so they carry keep_alive and the system
+        prompt as a stable first message. Several queries are packed into one
+        numbered prompt and the model returns all answers as JSON; if the reply
+        can't be matched to the queries, each query is answered with its own
+        request instead.
+        
+        Args:
+            queries: User queries to answer
+            system_prompt: Optional system prompt shared by all queries
+            max_tokens: Maximum number of tokens to generate per query
+            
+        Returns:
+            Answers in query order
+        """
+        if len(queries) == 1:
+            return [self._chat_text(queries[0], system_prompt=system_prompt, max_tokens=max_tokens)]
+            
+        numbered = "\n".join(f"{i + 1}. {query}" for i, query in enumerate(queries))
+        prompt = (
+            "Answer each numbered question. Return a JSON object with an \"answers\" key "
+            f"holding a list of {len(queries)} strings, one answer per question, in order.\n"
+            f"{numbered}"
+        )
+        response = self._chat_text(
+            prompt,
+            system_prompt=system_prompt,
+            temperature=0.0,
+            max_tokens=max_tokens * len(queries) if max_tokens else None,
+            response_format="json"
+        )
+        
+        try:
+            answers = orjson.loads(response).get("answers")
+            if (isinstance(answers, list) and len(answers) == len(queries)
+                    and all(isinstance(answer, str) for answer in answers)):
+                return answers
+        except (ValueError, AttributeError):
+            pass
+            
+        logger.warning("Batched generation returned an unexpected format, answering queries individually")
+        return [self._chat_text(query, system_prompt=system_prompt, max_tokens=max_tokens) for query in queries]
+        
+    def _chat_text(self, prompt: str, **kwargs) -> str:
+        """Send a single user prompt through chat() and return the reply text."""
+        result = self.chat([{"role": "user", "content": prompt}], **kwargs)
+        return result.get("message", {}).get("content", "")
+        
     def generate_streaming(self, prompt: str, system_prompt: Optional[str] = None,
                           temperature: float = 0.7, max_tokens: Optional[int] = None):
         """
@@ -119,31 +237,37 @@ class LLMService:
                 
             # Make request to Ollama API with streaming
             logger.info(f"Generating text with streaming from model: {self.model}")
-            response = requests.post(
+            response = self.session.post(
                 f"{self.ollama_host}/api/generate", 
                 json=payload,
-                stream=True
+                stream=True,
+                timeout=self.TIMEOUT
             )
             
             if response.status_code == 200:
                 for line in response.iter_lines():
                     if line:
                         try:
-                            chunk = json.loads(line)
+                            chunk = orjson.loads(line)
                             if "response" in chunk:
                                 yield chunk["response"]
-                        except json.JSONDecodeError:
+                        except orjson.JSONDecodeError:
                             logger.warning(f"Failed to decode JSON from chunk: {line}")
             else:
                 logger.error(f"Failed to generate streaming text: {response.status_code}")
                 yield ""
                 
+        except requests.Timeout as e:
+            logger.error(f"Timed out during streaming text generation: {e}")
+            raise LLMTimeoutError(str(e)) from e
+            
         except Exception as e:
             logger.error(f"Error during streaming text generation: {e}")
             yield ""
             
     def chat(self, messages: List[Dict[str, str]], system_prompt: Optional[str] = None,
-            temperature: float = 0.7, max_tokens: Optional[int] = None) -> Dict[str, Any]:
+            temperature: float = 0.7, max_tokens: Optional[int] = None,
+            response_format: Optional[Union[str, Dict[str, Any]]] = None) -> Dict[str, Any]:
         """
         Generate a chat completion using the configured LLM.
         
@@ -152,40 +276,363 @@ class LLMService:
             system_prompt: Optional system prompt for context
             temperature: Controls randomness (0.0 to 1.0)
             max_tokens: Maximum number of tokens to generate
+            response_format: Optional output constraint passed as Ollama's
+                "format" ("json" or a JSON schema)
             
         Returns:
             Response containing the assistant's message
         """
         try:
-            # Prepare request payload
+            # Prepare request payload; /api/chat takes the system prompt as the
+            # first message, which also keeps it a stable cacheable prefix
+            if system_prompt:
+                messages = [{"role": "system", "content": system_prompt}, *messages]
+                
             payload = {
                 "model": self.model,
                 "messages": messages,
                 "stream": False,
+                "keep_alive": self.KEEP_ALIVE,
                 "options": {
                     "temperature": temperature
                 }
             }
             
-            if system_prompt:
-                payload["system"] = system_prompt
-                
             if max_tokens:
                 payload["options"]["num_predict"] = max_tokens
                 
+            if response_format:
+                payload["format"] = response_format
+                
             # Make request to Ollama API
             logger.info(f"Generating chat completion with model: {self.model}")
-            response = requests.post(
+            response = self.session.post(
                 f"{self.ollama_host}/api/chat", 
-                json=payload
+                json=payload,
+                timeout=self.TIMEOUT
             )
             
             if response.status_code == 200:
-                return response.json()
+                return orjson.loads(response.content)
             else:
                 logger.error(f"Failed to generate chat completion: {response.status_code}")
                 return {"message": {"content": ""}}
                 
+        except requests.Timeout as e:
+            logger.error(f"Timed out during chat completion: {e}")
+            raise LLMTimeoutError(str(e)) from e
+            
         except Exception as e:
             logger.error(f"Error during chat completion: {e}")
             return {"message": {"content": ""}}
+            
+    def chat_streaming(self, messages: List[Dict[str, str]], system_prompt: Optional[str] = None,
+                      temperature: float = 0.7, max_tokens: Optional[int] = None):
+        """
+        Generate a chat completion with streaming response.
+        
+        Like chat(), this goes through /api/chat with keep_alive, so the
+        shared system prompt stays cached between requests.
+        
+        Args:
+            messages: List of message dictionaries with 'role' and 'content' keys
+            system_prompt: Optional system prompt for context
+            temperature: Controls randomness (0.0 to 1.0)
+            max_tokens: Maximum number of tokens to generate
+            
+        Yields:
+            Generated text chunks of the assistant's message
+        """
+        try:
+            if system_prompt:
+                messages = [{"role": "system", "content": system_prompt}, *messages]
+                
+            payload = {
+                "model": self.model,
+                "messages": messages,
+                "stream": True,
+                "keep_alive": self.KEEP_ALIVE,
+                "options": {
+                    "temperature": temperature
+                }
+            }
+            
+            if max_tokens:
+                payload["options"]["num_predict"] = max_tokens
+                
+            # Make request to Ollama API with streaming
+            logger.info(f"Generating chat completion with streaming from model: {self.model}")
+            response = self.session.post(
+                f"{self.ollama_host}/api/chat",
+                json=payload,
+                stream=True,
+                timeout=self.TIMEOUT
+            )
+            
+            if response.status_code == 200:
+                for line in response.iter_lines():
+                    if line:
+                        try:
+                            chunk = orjson.loads(line)
+                            content = chunk.get("message", {}).get("content")
+                            if content:
+                                yield content
+                        except orjson.JSONDecodeError:
+                            logger.warning(f"Failed to decode JSON from chunk: {line}")
+            else:
+                logger.error(f"Failed to generate streaming chat completion: {response.status_code}")
+                yield ""
+                
+        except requests.Timeout as e:
+            logger.error(f"Timed out during streaming chat completion: {e}")
+            raise LLMTimeoutError(str(e)) from e
+            
+        except Exception as e:
+            logger.error(f"Error during streaming chat completion: {e}")
+            yield ""
+            
+    def warm_up(self, system_prompt: Optional[str] = None) -> bool:
+        """
+        Load the model and prefill a system prompt with a one-token chat, so
+        the first real request doesn't pay for model load and prompt prefill.
+        
+        Args:
+            system_prompt: System prompt later requests will share
+            
+        Returns:
+            True if the warm-up request succeeded, False otherwise
+        """
+        if not self.is_available():
+            return False
+            
+        response = self.chat(
+            messages=[{"role": "user", "content": "ok"}],
+            system_prompt=system_prompt,
+            max_tokens=1
+        )
+        return "error" not in response and bool(response.get("message"))
+        
+    def close(self):
+        """Close pooled HTTP connections, including the async clients."""
+        self.session.close()
+        
+        clients, self._aclients = self._aclients, {}
+        for loop, client in clients.items():
+            self._close_aclient(loop, client)
+            
+    def _close_aclient(self, loop: asyncio.AbstractEventLoop, client: httpx.AsyncClient):
+        """
+        Close an async client on the event loop it was created in.
+        
+        Args:
+            loop: Event loop the client belongs to
+            client: Async client to close
+        """
+        if loop.is_closed():
+            # Its connections can't be closed without their loop
+            return
+            
+        try:
+            if loop.is_running():
+                future = asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+                try:
+                    in_loop = asyncio.get_running_loop() is loop
+                except RuntimeError:
+                    in_loop = False
+                    
+                # Waiting from inside the loop itself would deadlock
+                if not in_loop:
+                    future.result(timeout=5.0)
+            else:
+                loop.run_until_complete(client.aclose())
+                
+        except Exception as e:
+            logger.warning(f"Error closing async HTTP client: {e}")
+            
+    def _get_aclient(self) -> httpx.AsyncClient:
+        """Get the async HTTP client for the running event loop, creating it if needed."""
+        loop = asyncio.get_running_loop()
+        client = self._aclients.get(loop)
+        if client is None:
+            # Forget clients of loops that were closed without aclose()
+            for closed_loop in [l for l in self._aclients if l.is_closed()]:
+                del self._aclients[closed_loop]
+                
+            # Multiplex concurrent requests over HTTP/2 when h2 is installed
+            client = self._aclients[loop] = httpx.AsyncClient(
+                http2=importlib.util.find_spec("h2") is not None,
+                timeout=httpx.Timeout(self.TIMEOUT[1], connect=self.TIMEOUT[0]),
+                limits=httpx.Limits(
+                    max_keepalive_connections=40,
+                    max_connections=100,
+                    keepalive_expiry=30.0
+                )
+            )
+        return client
+        
+    def _build_payload(self, key: str, value: Any, stream: bool, system_prompt: Optional[str],
+                       temperature: float, max_tokens: Optional[int],
+                       response_format: Optional[Union[str, Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """Build an Ollama request payload for a prompt or a message list."""
+        payload = {
+            "model": self.model,
+            key: value,
+            "stream": stream,
+            "options": {
+                "temperature": temperature
+            }
+        }
+        
+        if system_prompt:
+            payload["system"] = system_prompt
+            
+        if max_tokens:
+            payload["options"]["num_predict"] = max_tokens
+            
+        if response_format:
+            payload["format"] = response_format
+            
+        return payload
+        
+    async def agenerate(self, prompt: str, system_prompt: Optional[str] = None,
+                        temperature: float = 0.7, max_tokens: Optional[int] = None,
+                        response_format: Optional[Union[str, Dict[str, Any]]] = None) -> str:
+        """
+        Generate text using the configured LLM without blocking the event loop.
+        
+        Args:
+            prompt: The user prompt to process
+            system_prompt: Optional system prompt for context
+            temperature: Controls randomness (0.0 to 1.0)
+            max_tokens: Maximum number of tokens to generate
+            response_format: Optional output constraint passed as Ollama's "format"
+            
+        Returns:
+            Generated text
+        """
+        try:
+            payload = self._build_payload(
+                "prompt", prompt, False, system_prompt, temperature, max_tokens, response_format
+            )
+            
+            logger.info(f"Generating text with model: {self.model}")
+            response = await self._get_aclient().post(f"{self.ollama_host}/api/generate", json=payload)
+            
+            if response.status_code == 200:
+                return orjson.loads(response.content).get("response", "")
+            else:
+                logger.error(f"Failed to generate text: {response.status_code}")
+                return ""
+                
+        except httpx.TimeoutException as e:
+            logger.error(f"Timed out during text generation: {e}")
+            raise LLMTimeoutError(str(e)) from e
+            
+        except Exception as e:
+            logger.error(f"Error during text generation: {e}")
+            return ""
+            
+    async def agenerate_streaming(self, prompt: str, system_prompt: Optional[str] = None,
+                                  temperature: float = 0.7,
+                                  max_tokens: Optional[int] = None) -> AsyncIterator[str]:
+        """
+        Generate text with a streaming response without blocking the event loop.
+        
+        Args:
+            prompt: The user prompt to process
+            system_prompt: Optional system prompt for context
+            temperature: Controls randomness (0.0 to 1.0)
+            max_tokens: Maximum number of tokens to generate
+            
+        Yields:
+            Generated text chunks
+        """
+        try:
+            payload = self._build_payload("prompt", prompt, True, system_prompt, temperature, max_tokens)
+            
+            logger.info(f"Generating text with streaming from model: {self.model}")
+            async with self._get_aclient().stream(
+                "POST", f"{self.ollama_host}/api/generate", json=payload
+            ) as response:
+                if response.status_code == 200:
+                    async for line in response.aiter_lines():
+                        if line:
+                            try:
+                                chunk = orjson.loads(line)
+                                if "response" in chunk:
+                                    yield chunk["response"]
+                            except orjson.JSONDecodeError:
+                                logger.warning(f"Failed to decode JSON from chunk: {line}")
+                else:
+                    logger.error(f"Failed to generate streaming text: {response.status_code}")
+                    yield ""
+                    
+        except httpx.TimeoutException as e:
+            logger.error(f"Timed out during streaming text generation: {e}")
+            raise LLMTimeoutError(str(e)) from e
+            
+        except Exception as e:
+            logger.error(f"Error during streaming text generation: {e}")
+            yield ""
+            
+    async def achat(self, messages: List[Dict[str, str]], system_prompt: Optional[str] = None,
+                    temperature: float = 0.7, max_tokens: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Generate a chat completion without blocking the event loop.
+        
+        Args:
+            messages: List of message dictionaries with 'role' and 'content' keys
+            system_prompt: Optional system prompt for context
+            temperature: Controls randomness (0.0 to 1.0)
+            max_tokens: Maximum number of tokens to generate
+            
+        Returns:
+            Response containing the assistant's message
+        """
+        try:
+            if system_prompt:
+                messages = [{"role": "system", "content": system_prompt}, *messages]
+                
+            payload = self._build_payload("messages", messages, False, None, temperature, max_tokens)
+            payload["keep_alive"] = self.KEEP_ALIVE
+            
+            logger.info(f"Generating chat completion with model: {self.model}")
+            response = await self._get_aclient().post(f"{self.ollama_host}/api/chat", json=payload)
+            
+            if response.status_code == 200:
+                return orjson.loads(response.content)
+            else:
+                logger.error(f"Failed to generate chat completion: {response.status_code}")
+                return {"message": {"content": ""}}
+                
+        except httpx.TimeoutException as e:
+            logger.error(f"Timed out during chat completion: {e}")
+            raise LLMTimeoutError(str(e)) from e
+            
+        except Exception as e:
+            logger.error(f"Error during chat completion: {e}")
+            return {"message": {"content": ""}}
+            
+    async def abatch_generate(self, prompts: List[str], system_prompt: Optional[str] = None,
+                              temperature: float = 0.7, max_tokens: Optional[int] = None) -> List[str]:
+        """
+        Generate text for several prompts concurrently.
+        
+        Args:
+            prompts: User prompts to process
+            system_prompt: Optional system prompt shared by all prompts
+            temperature: Controls randomness (0.0 to 1.0)
+            max_tokens: Maximum number of tokens to generate per prompt
+            
+        Returns:
+            Generated texts in prompt order
+        """
+        return list(await asyncio.gather(*(
+            self.agenerate(prompt, system_prompt, temperature, max_tokens) for prompt in prompts
+        )))
+        
+    async def aclose(self):
+        """Close the async HTTP client of the running event loop."""
+        client = self._aclients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
@@ -1,6 +1,12 @@
 import os
-import tempfile
+import time
+import socket
+import struct
+import threading
+import socketserver
+import importlib.util
 import numpy as np
+import torch
 import whisper
 import pyaudio
 import wave
@@ -9,6 +15,64 @@ from typing import Optional, Tuple
 from loguru import logger
 
 from config.settings import settings
+from core._audio_jit import chunk_magnitude_sums, compile_audio_helpers, int16_to_float32
+from core._portaudio import portaudio_lock
+
+# Shared model server protocol: a request header (language length, audio byte
+# length) followed by the language and float32 samples; the reply is the
+# length-prefixed UTF-8 transcription
+_REQUEST_HEADER = struct.Struct("!HI")
+_RESPONSE_HEADER = struct.Struct("!I")
+
+
+def _recv_exact(conn: socket.socket, size: int) -> bytearray:
+    """
+    Read exactly size bytes from a socket.
+    
+    Args:
+        conn: Connected socket
+        size: Number of bytes to read
+        
+    Returns:
+        Received bytes
+    """
+    buf = bytearray(size)
+    view = memoryview(buf)
+    received = 0
+    
+    while received < size:
+        count = conn.recv_into(view[received:])
+        if not count:
+            raise ConnectionError("Connection closed by peer")
+        received += count
+        
+    return buf
+
+
+class _TranscriptionHandler(socketserver.BaseRequestHandler):
+    """Answers transcription requests on one client connection until it closes."""
+    
+    def handle(self):
+        stt = self.server.stt
+        conn = self.request
+        
+        while True:
+            try:
+                language_size, audio_size = _REQUEST_HEADER.unpack(_recv_exact(conn, _REQUEST_HEADER.size))
+                language = _recv_exact(conn, language_size).decode()
+                audio = np.frombuffer(_recv_exact(conn, audio_size), dtype=np.float32)
+            except ConnectionError:
+                return
+                
+            try:
+                with stt._model_lock:
+                    text = stt._run_model(audio, language)
+            except Exception as e:
+                logger.error(f"Error during shared transcription: {e}")
+                text = ""
+                
+            encoded = text.encode()
+            conn.sendall(_RESPONSE_HEADER.pack(len(encoded)) + encoded)
 
 
 class SpeechToText:
@@ -23,28 +87,134 @@ class SpeechToText:
         self.audio_device_index = settings.general.audio_device_index
         
         self.model = None
+        self.device = "cpu"
+        self.use_faster_whisper = False
         self.audio = None
         self.sample_rate = 16000  # Whisper works with 16kHz audio
         self.is_recording = False
         self.audio_stream = None
         
+        # Reusable int16 PCM buffer that recordings are written into
+        self.max_record_seconds = 10
+        self._pcm_buf = None
+        
+        # Scratch buffers reused by the conversions in and out of int16
+        self._abs_scratch = None
+        self._f32_scratch = None
+        self._i16_scratch = None
+        
+        self._init_lock = threading.Lock()
+        self._initialized = False
+        
+        # Transcribe through a shared model server instead of a local model
+        self.server_socket = settings.stt.server_socket
+        self._server_conn = None
+        self._server_lock = threading.Lock()
+        self._model_lock = threading.Lock()
+        
     def initialize(self):
-        """Initialize the STT model and audio interface."""
+        """
+        Initialize the STT model and audio interface.
+        
+        Safe to call more than once; only the first successful call loads the
+        model. Must be called before recording or transcribing.
+        """
+        with self._init_lock:
+            if self._initialized:
+                return True
+            return self._initialize()
+            
+    def _initialize(self) -> bool:
+        """Load and warm up the model and open the audio interface."""
         try:
-            # Initialize Whisper model
-            logger.info(f"Loading Whisper model: {self.model_name}")
-            self.model = whisper.load_model(self.model_name)
+            if self.server_socket:
+                logger.info(f"Using shared Whisper model at {self.server_socket}")
+            else:
+                self._load_model()
             
             # Initialize PyAudio
-            self.audio = pyaudio.PyAudio()
+            with portaudio_lock:
+                self.audio = pyaudio.PyAudio()
+            
+            # Preallocate the recording buffer for the default max duration
+            self._pcm_buf = np.empty(self.sample_rate * self.max_record_seconds, dtype=np.int16)
             
+            # Compile the audio helpers now rather than on the first recording
+            compile_audio_helpers()
+            
+            self._initialized = True
             logger.info("Speech-to-Text initialized successfully")
             return True
             
         except Exception as e:
             logger.error(f"Failed to initialize Speech-to-Text: {e}")
             return False
-    
+            
+    def _load_model(self):
+        """Load the Whisper model for the detected device and warm it up."""
+        # Run on the GPU when available, with fp16 there and int8 on CPU
+        self.device = "cuda" if torch.cuda.is_available() else "cpu"
+        
+        # Prefer the CTranslate2 backend when faster-whisper is installed
+        self.use_faster_whisper = importlib.util.find_spec("faster_whisper") is not None
+        
+        if self.use_faster_whisper:
+            from faster_whisper import WhisperModel
+            compute_type = "float16" if self.device == "cuda" else "int8"
+            logger.info(f"Loading faster-whisper model: {self.model_name} ({self.device}, {compute_type})")
+            self.model = WhisperModel(self.model_name, device=self.device, compute_type=compute_type)
+        else:
+            logger.info(f"Loading Whisper model: {self.model_name} ({self.device})")
+            self.model = whisper.load_model(self.model_name, device=self.device)
+            
+        # Run one second of silence through the model so the first real
+        # transcription doesn't pay for kernel setup
+        try:
+            self._run_model(np.zeros(self.sample_rate, dtype=np.float32), self.language)
+        except Exception as e:
+            logger.warning(f"Whisper warm-up failed: {e}")
+            
+    def serve(self, socket_path: Optional[str] = None) -> bool:
+        """
+        Load the model once and serve transcriptions to other processes.
+        
+        Blocks until interrupted. Processes whose WHISPER_SERVER_SOCKET points
+        at the socket transcribe through this model instead of loading their own.
+        
+        Args:
+            socket_path: Unix socket path, defaults to the configured socket
+            
+        Returns:
+            False if the server could not be started
+        """
+        socket_path = socket_path or self.server_socket
+        if not socket_path:
+            logger.error("No Whisper server socket configured")
+            return False
+            
+        try:
+            self._load_model()
+            
+            # Replace a socket file left behind by a previous server
+            if os.path.exists(socket_path):
+                os.unlink(socket_path)
+                
+            with socketserver.ThreadingUnixStreamServer(socket_path, _TranscriptionHandler) as server:
+                server.daemon_threads = True
+                server.stt = self
+                logger.info(f"Serving Whisper model on {socket_path}")
+                
+                try:
+                    server.serve_forever()
+                finally:
+                    os.unlink(socket_path)
+                    
+            return True
+            
+        except Exception as e:
+            logger.error(f"Failed to serve Whisper model: {e}")
+            return False
+            
     def record_audio(self, duration: int = 5, silence_threshold: float = 0.03, 
                     silence_duration: float = 1.0) -> Tuple[np.ndarray, bool]:
         """
@@ -57,21 +227,42 @@ class SpeechToText:
             
         Returns:
             Tuple containing audio data as numpy array and a boolean indicating if 
-            recording stopped due to silence
+            recording stopped due to silence. The array is a view of a reused
+            buffer and is overwritten by the next recording, so copy it to keep it.
         """
-        if not self.audio:
-            self.initialize()
-            
         CHUNK = 1024
         FORMAT = pyaudio.paInt16
         CHANNELS = 1
         RATE = self.sample_rate
         
         self.is_recording = True
-        frames = []
         silent_chunks = 0
         required_silent_chunks = int(silence_duration * RATE / CHUNK)
         max_chunks = int(duration * RATE / CHUNK)
+        capacity = max_chunks * CHUNK
+        
+        # PyAudio's callback thread writes straight into one contiguous buffer
+        if self._pcm_buf is None or len(self._pcm_buf) < capacity:
+            self._pcm_buf = np.empty(capacity, dtype=np.int16)
+        pcm_buf = self._pcm_buf
+        recorded = 0
+        
+        # Silence is checked in integer space: the summed magnitude of a chunk
+        # is compared with the threshold pre-scaled to int16 units
+        if self._abs_scratch is None or len(self._abs_scratch) < capacity:
+            self._abs_scratch = np.empty(capacity, dtype=np.int16)
+        abs_buf = self._abs_scratch
+        silence_sum = int(silence_threshold * 32768 * CHUNK)
+        
+        def on_audio(in_data, frame_count, time_info, status):
+            nonlocal recorded
+            count = min(frame_count, capacity - recorded)
+            pcm_buf[recorded:recorded + count] = np.frombuffer(in_data, dtype=np.int16, count=count)
+            recorded += count
+            
+            if recorded >= capacity or not self.is_recording:
+                return (None, pyaudio.paComplete)
+            return (None, pyaudio.paContinue)
         
         # Start recording
         stream = self.audio.open(
@@ -80,31 +271,36 @@ class SpeechToText:
             rate=RATE,
             input=True,
             frames_per_buffer=CHUNK,
-            input_device_index=self.audio_device_index
+            input_device_index=self.audio_device_index,
+            stream_callback=on_audio
         )
         
         logger.info("Started recording audio")
         
         try:
-            # Record audio until silence or max duration
-            for i in range(max_chunks):
-                if not self.is_recording:
-                    break
-                
-                data = stream.read(CHUNK, exception_on_overflow=False)
-                frames.append(data)
-                
-                # Check for silence to auto-stop recording
-                audio_data = np.frombuffer(data, dtype=np.int16)
-                volume_norm = np.abs(audio_data).mean() / 32768.0
+            checked = 0
+            poll_interval = CHUNK / RATE
+            
+            # Check each newly written chunk until silence or max duration
+            while self.is_recording and stream.is_active():
+                time.sleep(poll_interval)
                 
-                if volume_norm < silence_threshold:
-                    silent_chunks += 1
-                    if silent_chunks >= required_silent_chunks:
-                        logger.info("Silence detected, stopping recording")
-                        break
-                else:
-                    silent_chunks = 0
+                new_chunks = (recorded - checked) // CHUNK
+                if new_chunks:
+                    # Sum the magnitude of every chunk written since the last poll in one pass
+                    end = checked + new_chunks * CHUNK
+                    volume_sums = chunk_magnitude_sums(pcm_buf[checked:end], CHUNK, abs_buf[checked:end])
+                    checked = end
+                    
+                    # Check for silence to auto-stop recording
+                    for silent in (volume_sums < silence_sum).tolist():
+                        silent_chunks = silent_chunks + 1 if silent else 0
+                        if silent_chunks >= required_silent_chunks:
+                            break
+                            
+                if silent_chunks >= required_silent_chunks:
+                    logger.info("Silence detected, stopping recording")
+                    break
         
         except Exception as e:
             logger.error(f"Error during recording: {e}")
@@ -117,14 +313,25 @@ class SpeechToText:
             
             logger.info("Recording stopped")
             
-            # Convert frames to numpy array
-            audio_data = np.frombuffer(b''.join(frames), dtype=np.int16).astype(np.float32) / 32768.0
+            # Convert recorded samples to float32 in one pass into the reused buffer
+            if self._f32_scratch is None or len(self._f32_scratch) < recorded:
+                self._f32_scratch = np.empty(max(recorded, capacity), dtype=np.float32)
+            audio_data = int16_to_float32(pcm_buf[:recorded], self._f32_scratch[:recorded])
             return audio_data, silent_chunks >= required_silent_chunks
     
     def save_audio_to_file(self, audio_data: np.ndarray, filename: str = "recording.wav"):
         """Save recorded audio to a WAV file."""
-        # Convert float array back to int16
-        audio_int16 = (audio_data * 32768).astype(np.int16)
+        # Convert float array back to int16, rounding and clipping in float32
+        # before a single cast into the reused int16 buffer
+        count = len(audio_data)
+        if self._i16_scratch is None or len(self._i16_scratch) < count:
+            self._i16_scratch = np.empty(count, dtype=np.int16)
+        audio_int16 = self._i16_scratch[:count]
+        
+        scaled = np.multiply(audio_data, 32768.0, dtype=np.float32)
+        np.rint(scaled, out=scaled)
+        np.clip(scaled, -32768, 32767, out=scaled)
+        np.copyto(audio_int16, scaled, casting="unsafe")
         
         # Create a temporary WAV file
         with wave.open(filename, 'wb') as wf:
@@ -147,45 +354,28 @@ class SpeechToText:
         Returns:
             Transcribed text
         """
-        if not self.model:
-            self.initialize()
-            
         try:
             # Transcribe either audio data or audio file
             if audio_data is not None:
-                # Create temporary file for audio data
-                with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as temp_file:
-                    temp_filename = temp_file.name
-                
-                # Save audio data to temporary file
-                self.save_audio_to_file(audio_data, temp_filename)
-                
-                # Transcribe audio file
+                # Whisper takes 16 kHz float32 samples directly, so skip the WAV round-trip
+                if audio_data.dtype == np.int16:
+                    audio_data = int16_to_float32(audio_data, np.empty(len(audio_data), dtype=np.float32))
+                elif audio_data.dtype != np.float32:
+                    audio_data = audio_data.astype(np.float32)
+                    
                 logger.info("Transcribing audio data")
-                result = self.model.transcribe(
-                    temp_filename, 
-                    language=self.language if self.language else None,
-                    fp16=False
-                )
-                
-                # Clean up temporary file
-                os.unlink(temp_filename)
+                transcription = self._transcribe(audio_data)
                 
             elif audio_file and os.path.exists(audio_file):
                 # Transcribe provided audio file
                 logger.info(f"Transcribing audio file: {audio_file}")
-                result = self.model.transcribe(
-                    audio_file, 
-                    language=self.language if self.language else None,
-                    fp16=False
-                )
+                transcription = self._transcribe(audio_file)
                 
             else:
                 logger.error("No audio data or valid audio file provided for transcription")
                 return ""
                 
             # Return transcribed text
-            transcription = result["text"].strip()
             logger.info(f"Transcription: {transcription}")
             return transcription
             
@@ -193,6 +383,84 @@ class SpeechToText:
             logger.error(f"Error during transcription: {e}")
             return ""
             
+    def _transcribe(self, audio) -> str:
+        """
+        Transcribe with the local model or the shared model server.
+        
+        Args:
+            audio: float32 samples at 16 kHz, or path to an audio file
+            
+        Returns:
+            Transcribed text
+        """
+        if not self.server_socket:
+            return self._run_model(audio, self.language)
+            
+        if isinstance(audio, str):
+            audio = whisper.load_audio(audio)
+        return self._transcribe_remote(audio)
+        
+    def _run_model(self, audio, language: Optional[str]) -> str:
+        """
+        Run the loaded model on audio samples or an audio file path.
+        
+        Args:
+            audio: float32 samples at 16 kHz, or path to an audio file
+            language: Spoken language, or None to detect it
+            
+        Returns:
+            Transcribed text
+        """
+        language = language if language else None
+        
+        if self.use_faster_whisper:
+            segments, _ = self.model.transcribe(audio, language=language)
+            return "".join(segment.text for segment in segments).strip()
+            
+        result = self.model.transcribe(audio, language=language, fp16=self.device == "cuda")
+        return result["text"].strip()
+        
+    def _transcribe_remote(self, audio: np.ndarray) -> str:
+        """
+        Send samples to the shared model server and wait for the transcription.
+        
+        The connection is kept open between calls and reopened once if it broke.
+        
+        Args:
+            audio: float32 samples at 16 kHz
+            
+        Returns:
+            Transcribed text
+        """
+        samples = np.ascontiguousarray(audio, dtype=np.float32)
+        language = (self.language or "").encode()
+        header = _REQUEST_HEADER.pack(len(language), samples.nbytes)
+        
+        with self._server_lock:
+            for attempt in range(2):
+                try:
+                    if self._server_conn is None:
+                        self._server_conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                        self._server_conn.connect(self.server_socket)
+                        
+                    conn = self._server_conn
+                    conn.sendall(header + language)
+                    conn.sendall(samples)
+                    
+                    (size,) = _RESPONSE_HEADER.unpack(_recv_exact(conn, _RESPONSE_HEADER.size))
+                    return _recv_exact(conn, size).decode()
+                    
+                except OSError:
+                    self._close_server_conn()
+                    if attempt:
+                        raise
+                        
+    def _close_server_conn(self):
+        """Close the connection to the shared model server, if any."""
+        if self._server_conn is not None:
+            self._server_conn.close()
+            self._server_conn = None
+            
     def listen_and_transcribe(self, max_duration: int = 10) -> str:
         """
         Record audio from microphone and transcribe it to text.
@@ -220,8 +488,15 @@ class SpeechToText:
         
     def cleanup(self):
         """Release audio resources."""
-        if self.audio:
-            self.audio.terminate()
-            self.audio = None
+        with self._init_lock:
+            if self.audio:
+                with portaudio_lock:
+                    self.audio.terminate()
+                self.audio = None
+                
+            self._initialized = False
+            
+        with self._server_lock:
+            self._close_server_conn()
             
         logger.info("Speech-to-Text resources released")
@@ -1,16 +1,22 @@
 import os
+import hashlib
+import importlib.util
 import tempfile
+import functools
+import threading
 import subprocess
+import wave
 import numpy as np
 import pyaudio
 from pathlib import Path
-from typing import Optional, Union
+from typing import Iterable, Optional, Union
 from loguru import logger
 from TTS.api import TTS as CoquiTTS
 from pydub import AudioSegment
 from pydub.playback import play
 
 from config.settings import settings
+from core._portaudio import portaudio_lock
 
 
 class TextToSpeech:
@@ -25,9 +31,24 @@ class TextToSpeech:
         self.language = settings.tts.language
         
         self.tts_engine = None
+        self.piper_voice = None
         self.audio = None
+        self._output_stream = None
+        self._output_format = None
         self.use_piper = 'piper' in self.model.lower()
         
+        # Fixed phrases registered with precache() are kept on disk, keyed by
+        # voice and text; everything else is synthesized to a temporary file
+        self.cache_dir = Path(settings.tts.cache_dir or tempfile.gettempdir()) / "jarvis_tts"
+        self._cached_phrases = set()
+        self._cache_path = functools.lru_cache(maxsize=256)(self._resolve_cache_path)
+        self._synth_lock = threading.Lock()
+        
+        # Serializes playback on the shared output stream, so concurrent
+        # utterances play one after another instead of interleaving
+        self._play_lock = threading.RLock()
+        self._ready = threading.Event()
+        
     def initialize(self):
         """Initialize the TTS model."""
         try:
@@ -35,8 +56,14 @@ class TextToSpeech:
                 # Initialize Coqui TTS
                 logger.info(f"Loading Coqui TTS model: {self.model}")
                 self.tts_engine = CoquiTTS(model_name=self.model, progress_bar=False)
+            elif importlib.util.find_spec("piper") is not None:
+                # Keep the Piper voice loaded in-process instead of starting
+                # the binary (and reloading the ONNX model) per utterance
+                from piper import PiperVoice
+                logger.info(f"Loading Piper voice: {self._piper_model_path()}")
+                self.piper_voice = PiperVoice.load(self._piper_model_path())
             else:
-                # For Piper, we'll verify the binary is installed
+                # Fall back to the piper binary, so verify it is installed
                 piper_command = ["piper", "--help"]
                 try:
                     subprocess.run(piper_command, capture_output=True, check=True)
@@ -46,7 +73,11 @@ class TextToSpeech:
                     return False
             
             # Initialize PyAudio for playback
-            self.audio = pyaudio.PyAudio()
+            with portaudio_lock:
+                self.audio = pyaudio.PyAudio()
+            
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            self._ready.set()
             
             logger.info("Text-to-Speech initialized successfully")
             return True
@@ -109,28 +140,22 @@ class TextToSpeech:
                 output_file = temp_file.name
                 temp_file.close()
             
-            # Prepare model path - extract from settings
-            model_parts = self.model.split('/')
-            model_name = model_parts[-1] if len(model_parts) > 0 else "en_US-lessac-medium"
-            
-            # Run Piper TTS command
             logger.info(f"Synthesizing speech with Piper TTS: {text[:50]}...")
             
-            with tempfile.NamedTemporaryFile(mode='w+', delete=False) as text_file:
-                text_file.write(text)
-                text_file_path = text_file.name
-            
+            # Synthesize with the resident voice when it is loaded
+            if self.piper_voice:
+                with wave.open(output_file, "wb") as wav_file:
+                    self.piper_voice.synthesize(text, wav_file)
+                return output_file
+                
+            # Run Piper TTS command, passing the text on stdin
             piper_command = [
                 "piper",
-                "--model", f"/app/models/piper/{model_name}.onnx",
-                "--output_file", output_file,
-                "--text_file", text_file_path
+                "--model", self._piper_model_path(),
+                "--output_file", output_file
             ]
             
-            subprocess.run(piper_command, check=True)
-            
-            # Clean up text file
-            os.unlink(text_file_path)
+            subprocess.run(piper_command, input=text.encode(), check=True)
             
             return output_file
             
@@ -138,10 +163,20 @@ class TextToSpeech:
             logger.error(f"Error during Piper TTS synthesis: {e}")
             return ""
             
+    def _piper_model_path(self) -> str:
+        """Get the Piper ONNX model path for the configured model name."""
+        model_parts = self.model.split('/')
+        model_name = model_parts[-1] if len(model_parts) > 0 else "en_US-lessac-medium"
+        return f"/app/models/piper/{model_name}.onnx"
+        
     def synthesize(self, text: str, output_file: Optional[str] = None) -> str:
         """
         Synthesize speech using the configured TTS engine.
         
+        Without an output file, phrases registered with precache() are served
+        from, or stored in, the on-disk cache; other text is synthesized to a
+        temporary file the caller is responsible for deleting.
+        
         Args:
             text: Text to synthesize
             output_file: Optional path to save the audio file
@@ -149,11 +184,68 @@ class TextToSpeech:
         Returns:
             Path to the output file
         """
-        if self.use_piper:
-            return self.synthesize_piper(text, output_file)
-        else:
-            return self.synthesize_coqui(text, output_file)
+        if output_file or text not in self._cached_phrases:
+            return self._synthesize_engine(text, output_file)
+            
+        cache_path = self._cache_path(text)
+        if cache_path.exists():
+            return str(cache_path)
             
+        # Synthesize to a private file and move it into place, so a failed or
+        # concurrent synthesis never leaves a partial cache entry
+        partial_path = cache_path.with_name(f"{cache_path.stem}.{threading.get_ident()}.part.wav")
+        try:
+            if not self._synthesize_engine(text, str(partial_path)):
+                return ""
+                
+            os.replace(partial_path, cache_path)
+            return str(cache_path)
+        finally:
+            partial_path.unlink(missing_ok=True)
+        
+    def _synthesize_engine(self, text: str, output_file: Optional[str]) -> str:
+        """Run the configured engine, one utterance at a time."""
+        with self._synth_lock:
+            if self.use_piper:
+                return self.synthesize_piper(text, output_file)
+            else:
+                return self.synthesize_coqui(text, output_file)
+                
+    def _resolve_cache_path(self, text: str) -> Path:
+        """
+        Get the cache file for an utterance in the configured voice.
+        
+        Args:
+            text: Text to synthesize
+            
+        Returns:
+            Path of the cached WAV file
+        """
+        key = f"{self.model}|{self.speaker}|{self.language}|{text}".encode()
+        return self.cache_dir / f"{hashlib.blake2b(key, digest_size=16).hexdigest()}.wav"
+        
+    def precache(self, phrases: Iterable[str]):
+        """
+        Synthesize fixed phrases into the cache in the background.
+        
+        Only phrases registered here are cached; speaking them later reuses
+        the cached file. Waits for initialize() to finish, and skips phrases
+        that are already cached from an earlier run.
+        
+        Args:
+            phrases: Phrases to synthesize
+        """
+        phrases = tuple(phrases)
+        self._cached_phrases.update(phrases)
+        
+        def fill_cache():
+            self._ready.wait()
+            for phrase in phrases:
+                if not self._cache_path(phrase).exists():
+                    self.synthesize(phrase)
+                    
+        threading.Thread(target=fill_cache, daemon=True).start()
+        
     def play_audio_file(self, file_path: str):
         """
         Play an audio file through the system's audio output.
@@ -166,14 +258,69 @@ class TextToSpeech:
                 logger.error(f"Audio file does not exist: {file_path}")
                 return
                 
-            # Load and play audio
             logger.info(f"Playing audio file: {file_path}")
-            audio = AudioSegment.from_file(file_path)
-            play(audio)
+            
+            # Stream WAVs straight to PyAudio; other formats go through pydub
+            if self.audio and file_path.lower().endswith(".wav"):
+                self._play_wav(file_path)
+            else:
+                audio = AudioSegment.from_file(file_path)
+                play(audio)
             
         except Exception as e:
             logger.error(f"Error playing audio file: {e}")
             
+    def _play_wav(self, file_path: str):
+        """
+        Write a WAV file's frames to the PyAudio output stream.
+        
+        Args:
+            file_path: Path to the WAV file to play
+        """
+        with wave.open(file_path, "rb") as wf, self._play_lock:
+            stream = self._get_output_stream(wf.getframerate(), wf.getnchannels(), wf.getsampwidth())
+            
+            data = wf.readframes(4096)
+            while data:
+                stream.write(data)
+                data = wf.readframes(4096)
+                
+    def _get_output_stream(self, rate: int, channels: int, sample_width: int):
+        """
+        Get an output stream for the given format, reusing the open one if it matches.
+        Called with _play_lock held.
+        
+        Args:
+            rate: Sample rate in Hz
+            channels: Number of channels
+            sample_width: Bytes per sample
+            
+        Returns:
+            PyAudio output stream
+        """
+        output_format = (rate, channels, sample_width)
+        if self._output_stream is not None and self._output_format == output_format:
+            return self._output_stream
+            
+        self._close_output_stream()
+        self._output_stream = self.audio.open(
+            format=self.audio.get_format_from_width(sample_width),
+            channels=channels,
+            rate=rate,
+            output=True
+        )
+        self._output_format = output_format
+        return self._output_stream
+        
+    def _close_output_stream(self):
+        """Close the cached output stream, if any."""
+        with self._play_lock:
+            if self._output_stream is not None:
+                self._output_stream.stop_stream()
+                self._output_stream.close()
+                self._output_stream = None
+                self._output_format = None
+            
     def speak(self, text: str, save_to_file: Optional[str] = None) -> Optional[str]:
         """
         Convert text to speech and play it.
@@ -191,33 +338,55 @@ class TextToSpeech:
             
         try:
             # Synthesize speech
+            temporary = not save_to_file and text not in self._cached_phrases
             output_file = self.synthesize(text, save_to_file)
             
             if not output_file or not os.path.exists(output_file):
                 logger.error("Failed to synthesize speech")
                 return None
                 
-            # Play the audio
-            self.play_audio_file(output_file)
-            
-            # Clean up temporary file if not saving
-            if not save_to_file and output_file:
-                try:
-                    os.unlink(output_file)
-                except Exception:
-                    pass
-                    
+            # Play the audio; cached phrases stay on disk for reuse
+            try:
+                self.play_audio_file(output_file)
+            finally:
+                # Clean up temporary file if not saving
+                if temporary:
+                    try:
+                        os.unlink(output_file)
+                    except Exception:
+                        pass
+                        
             return output_file if save_to_file else None
             
         except Exception as e:
             logger.error(f"Error during speech synthesis and playback: {e}")
             return None
             
+    def speak_stream(self, sentences: Iterable[str]):
+        """
+        Speak sentences one after another as the iterator yields them.
+        
+        The TTS model stays loaded across sentences, so each one costs only
+        its own synthesis and playback time.
+        
+        Args:
+            sentences: Iterable of sentences, e.g. fed from a queue while the
+                rest of the text is still being generated
+        """
+        for sentence in sentences:
+            if sentence:
+                self.speak(sentence)
+                
     def cleanup(self):
         """Release all resources."""
+        self._close_output_stream()
+        
         if self.audio:
-            self.audio.terminate()
+            with portaudio_lock:
+                self.audio.terminate()
             self.audio = None
             
         self.tts_engine = None
+        self.piper_voice = None
+        self._ready.clear()
         logger.info("Text-to-Speech resources released")
@@ -1,11 +1,12 @@
 import os
-import struct
-import pyaudio
-import pvporcupine
+import math
+import threading
+from collections import deque
 from typing import Callable, Optional
 from loguru import logger
 
 from config.settings import settings
+from core._portaudio import portaudio_lock
 
 
 class WakeWordDetector:
@@ -14,6 +15,13 @@ class WakeWordDetector:
     Listens for a specified wake word and triggers a callback when detected.
     """
     
+    # Seconds of captured audio allowed to wait for Porcupine; beyond this the
+    # oldest frames are dropped and counted in dropped_frames
+    MAX_BACKLOG_SECONDS = 2.0
+    
+    # Frames between sampled debug reports from the detection loop
+    STATS_LOG_INTERVAL = 1000
+    
     def __init__(self):
         self.access_key = settings.wake_word.access_key
         self.wake_word_path = settings.wake_word.wake_word_path
@@ -22,13 +30,32 @@ class WakeWordDetector:
         
         self.porcupine = None
         self.audio = None
+        self._pyaudio = None
         self.audio_stream = None
         self.is_running = False
         self.callback = None
         
+        # Frames discarded because the backlog was full
+        self.dropped_frames = 0
+        
+        # Porcupine frame size in samples and bytes, set by initialize()
+        self._frame_length = 0
+        self._frame_bytes = 0
+        
+        # Frames that may wait for Porcupine, and the frame buffers captured
+        # audio is copied into, with int16 views of each
+        self._max_backlog = 0
+        self._frame_bufs = []
+        self._frame_views = []
+        
     def initialize(self):
         """Initialize the wake word detector with the specified settings."""
         try:
+            # Imported here so the native libraries only load when wake word detection is used
+            import pvporcupine
+            import pyaudio
+            self._pyaudio = pyaudio
+            
             # Initialize Porcupine with either a built-in keyword or custom keyword file
             if self.wake_word_path and os.path.exists(self.wake_word_path):
                 self.porcupine = pvporcupine.create(
@@ -47,7 +74,18 @@ class WakeWordDetector:
             logger.info(f"Wake word detector initialized with {'custom' if self.wake_word_path else 'default'} wake word")
             
             # Initialize PyAudio
-            self.audio = pyaudio.PyAudio()
+            with portaudio_lock:
+                self.audio = pyaudio.PyAudio()
+            
+            # Preallocate the frame buffers and their int16 views once: one per
+            # frame the backlog can hold, plus the one Porcupine is reading
+            self._frame_length = self.porcupine.frame_length
+            self._frame_bytes = self._frame_length * 2
+            self._max_backlog = math.ceil(
+                self.MAX_BACKLOG_SECONDS * self.porcupine.sample_rate / self._frame_length
+            )
+            self._frame_bufs = [bytearray(self._frame_bytes) for _ in range(self._max_backlog + 1)]
+            self._frame_views = [memoryview(buf).cast("h") for buf in self._frame_bufs]
             
         except Exception as e:
             logger.error(f"Failed to initialize wake word detector: {e}")
@@ -71,31 +109,89 @@ class WakeWordDetector:
         self.callback = callback
         self.is_running = True
         
+        # PortAudio's callback thread copies each frame into the next reusable
+        # buffer and hands its index to this thread, so capture keeps running
+        # while Porcupine processes a frame. The backlog is bounded: when it is
+        # full the incoming frame is dropped, so the queued frames always occupy
+        # the buffers after the one Porcupine is reading and the buffer written
+        # next is never one of them
+        pyaudio = self._pyaudio
+        frames = deque()
+        frame_ready = threading.Event()
+        frame_bufs = self._frame_bufs
+        frame_bytes = self._frame_bytes
+        ring_size = len(frame_bufs)
+        max_backlog = self._max_backlog
+        put_frame = frames.append
+        signal_frame = frame_ready.set
+        keep_going = (None, pyaudio.paContinue)
+        slot = 0
+        
+        def on_audio(in_data, frame_count, time_info, status):
+            nonlocal slot
+            if len(in_data) == frame_bytes:
+                if len(frames) == max_backlog:
+                    self.dropped_frames += 1
+                    return keep_going
+                frame_bufs[slot][:] = in_data
+                put_frame(slot)
+                signal_frame()
+                slot = (slot + 1) % ring_size
+            return keep_going
+            
         try:
             self.audio_stream = self.audio.open(
                 rate=self.porcupine.sample_rate,
                 channels=1,
                 format=pyaudio.paInt16,
                 input=True,
-                frames_per_buffer=self.porcupine.frame_length,
-                input_device_index=self.audio_device_index
+                frames_per_buffer=self._frame_length,
+                input_device_index=self.audio_device_index,
+                stream_callback=on_audio
             )
             
             logger.info("Started listening for wake word")
             
-            # Start processing audio input
+            # Bind hot-loop lookups to locals
+            next_frame = frames.popleft
+            wait_for_frame = frame_ready.wait
+            clear_ready = frame_ready.clear
+            process = self.porcupine.process
+            frame_views = self._frame_views
+            callback = self.callback
+            
+            # Sampled debug report; lazy so nothing is formatted unless DEBUG is enabled
+            log_stats = logger.opt(lazy=True).debug
+            stats_interval = self.STATS_LOG_INTERVAL
+            processed = 0
+            
+            # Start processing audio input; the timeout lets stop() end the loop
             while self.is_running:
-                pcm = self.audio_stream.read(self.porcupine.frame_length, exception_on_overflow=False)
-                pcm = struct.unpack_from("h" * self.porcupine.frame_length, pcm)
+                try:
+                    index = next_frame()
+                except IndexError:
+                    wait_for_frame(0.5)
+                    clear_ready()
+                    continue
+                    
+                # Process the frame's int16 view with Porcupine
+                keyword_index = process(frame_views[index])
                 
-                # Process with Porcupine
-                keyword_index = self.porcupine.process(pcm)
+                processed += 1
+                if processed % stats_interval == 0:
+                    log_stats(
+                        "Wake word detector processed {} frames, {} waiting, {} dropped",
+                        lambda: processed, frames.__len__, lambda: self.dropped_frames
+                    )
                 
                 # If wake word detected (keyword_index >= 0)
                 if keyword_index >= 0:
                     logger.info("Wake word detected!")
-                    if self.callback:
-                        self.callback()
+                    if callback:
+                        callback()
+                        
+                    # Drop audio captured while the callback handled the command
+                    frames.clear()
                         
         except Exception as e:
             logger.error(f"Error in wake word detection: {e}")
@@ -121,7 +217,8 @@ class WakeWordDetector:
             self.porcupine = None
             
         if self.audio:
-            self.audio.terminate()
+            with portaudio_lock:
+                self.audio.terminate()
             self.audio = None
             
         logger.info("Wake word detector resources released")
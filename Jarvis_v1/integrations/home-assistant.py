@@ -1,6 +1,12 @@
+import time
+import asyncio
+import threading
 import requests
-import json
-from typing import Dict, List, Any, Optional
+import orjson
+import websockets
+from requests.adapters import HTTPAdapter
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Any, Optional, Sequence, Tuple, Union
 from loguru import logger
 
 from config.settings import settings
@@ -12,6 +18,20 @@ class HomeAssistantClient:
     Provides methods to interact with Home Assistant API.
     """
     
+    # Above this many affected entities, a service call refreshes all states
+    # with one request instead of one concurrent request per entity
+    BULK_REFRESH_THRESHOLD = 8
+    
+    # Longest wait between websocket reconnection attempts, in seconds
+    WS_RECONNECT_MAX_DELAY = 30.0
+    
+    # Age in seconds after which the entity cache is refetched, unless the
+    # state_changed subscription is keeping it current
+    CACHE_TTL = 60.0
+    
+    # How long an entity ID that returned 404 is answered as missing without a request, in seconds
+    NEGATIVE_CACHE_TTL = 5.0
+    
     def __init__(self):
         self.url = settings.home_assistant.url
         self.token = settings.home_assistant.token
@@ -19,19 +39,67 @@ class HomeAssistantClient:
             "Authorization": f"Bearer {self.token}",
             "Content-Type": "application/json",
         }
+        
+        # Pooled keep-alive connections to Home Assistant, reused across calls
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update(self.headers)
+        
         self.entities_cache = {}
         self.states_cache = {}
         
+        # Snapshot of entities_cache values returned by get_entities, rebuilt after changes
+        self._entities_list: Optional[Tuple[Dict[str, Any], ...]] = None
+        
+        # When the entity cache was last fully fetched (time.monotonic())
+        self._cache_ts = 0.0
+        
+        # Index of cached entities by domain, and their lower-cased friendly names and IDs
+        self._by_domain: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._name_lc: Dict[str, str] = {}
+        self._eid_lc: Dict[str, str] = {}
+        
+        # Caches are written by the websocket thread as well as callers
+        self._cache_lock = threading.Lock()
+        
+        # In-flight entity fetches shared by concurrent callers, and expiry
+        # times of entity IDs Home Assistant recently reported as not found
+        self._inflight: Dict[str, Future] = {}
+        self._inflight_lock = threading.Lock()
+        self._missing: Dict[str, float] = {}
+        
+        # state_changed subscription keeping the caches current
+        if self.url.startswith("https://"):
+            self.ws_url = "wss://" + self.url[len("https://"):] + "/api/websocket"
+        else:
+            self.ws_url = "ws://" + self.url[len("http://"):] + "/api/websocket"
+        self._ws_thread: Optional[threading.Thread] = None
+        self._ws_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._ws_task: Optional[asyncio.Task] = None
+        self._ws_connected = threading.Event()
+        
+        # Reusable receive buffer per camera, grown as needed and never shrunk
+        self._cam_bufs: Dict[str, bytearray] = {}
+        
+        # Threads for refreshing entities concurrently after a service call while
+        # the websocket subscription is down; threads start on first use
+        self._refresh_executor = ThreadPoolExecutor(
+            max_workers=self.BULK_REFRESH_THRESHOLD, thread_name_prefix="ha-refresh"
+        )
+        
     def initialize(self) -> bool:
         """Initialize the Home Assistant client and test the connection."""
         try:
             # Test connection by getting API status
-            response = requests.get(f"{self.url}/api/", headers=self.headers)
+            response = self.session.get(f"{self.url}/api/")
             
             if response.status_code == 200:
                 logger.info("Home Assistant connection successful")
-                # Refresh entities cache
+                # Refresh entities cache, then keep it current from state_changed events
                 self.get_entities()
+                self._start_state_subscription()
                 return True
             else:
                 logger.error(f"Failed to connect to Home Assistant: {response.status_code}")
@@ -41,69 +109,147 @@ class HomeAssistantClient:
             logger.error(f"Error initializing Home Assistant client: {e}")
             return False
             
-    def get_entities(self, force_refresh: bool = False) -> List[Dict[str, Any]]:
+    def get_entities(self, force_refresh: bool = False) -> Sequence[Dict[str, Any]]:
         """
         Get all entities from Home Assistant.
         
+        The cache is refetched when it is older than CACHE_TTL, unless the
+        state_changed subscription is keeping it current. If a refetch fails,
+        the stale cache is returned.
+        
         Args:
             force_refresh: Force refresh of entities cache
             
         Returns:
-            List of entity objects
+            Tuple of entity objects, shared between calls until the cache changes
         """
-        if not force_refresh and self.entities_cache:
-            return list(self.entities_cache.values())
+        if not force_refresh and self._is_fresh():
+            return self._entities_snapshot()
             
         try:
-            response = requests.get(f"{self.url}/api/states", headers=self.headers)
+            response = self.session.get(f"{self.url}/api/states")
             
             if response.status_code == 200:
-                entities = response.json()
+                entities = tuple(orjson.loads(response.content))
                 
                 # Update cache
-                self.entities_cache = {entity["entity_id"]: entity for entity in entities}
-                self.states_cache = {entity["entity_id"]: entity["state"] for entity in entities}
+                with self._cache_lock:
+                    self.entities_cache = {entity["entity_id"]: entity for entity in entities}
+                    self.states_cache = {entity["entity_id"]: entity["state"] for entity in entities}
+                    self._entities_list = entities
+                    self._rebuild_index()
+                    self._cache_ts = time.monotonic()
                 
                 logger.info(f"Retrieved {len(entities)} entities from Home Assistant")
                 return entities
             else:
                 logger.error(f"Failed to get entities: {response.status_code}")
-                return []
+                return self._entities_snapshot()
                 
         except Exception as e:
             logger.error(f"Error getting entities: {e}")
-            return []
+            return self._entities_snapshot()
+            
+    def _is_fresh(self) -> bool:
+        """Check whether the entity cache can be used without refetching it."""
+        if not self.entities_cache:
+            return False
+        return self._ws_connected.is_set() or time.monotonic() - self._cache_ts < self.CACHE_TTL
+        
+    def _entities_snapshot(self) -> Tuple[Dict[str, Any], ...]:
+        """Get the cached entities as a tuple, reusing the snapshot until the cache changes."""
+        entities = self._entities_list
+        if entities is None:
+            with self._cache_lock:
+                entities = self._entities_list = tuple(self.entities_cache.values())
+        return entities
+        
+    def _rebuild_index(self):
+        """Rebuild the domain index and lower-cased names from the entity cache."""
+        self._by_domain = {}
+        self._name_lc = {}
+        self._eid_lc = {}
+        for entity in self.entities_cache.values():
+            self._index_entity(entity)
+            
+    def _index_entity(self, entity: Dict[str, Any]):
+        """
+        Add or replace one entity in the domain index.
+        
+        Args:
+            entity: Entity object
+        """
+        entity_id = entity["entity_id"]
+        domain = entity_id.partition(".")[0]
+        self._by_domain.setdefault(domain, {})[entity_id] = entity
+        self._name_lc[entity_id] = entity.get("attributes", {}).get("friendly_name", "").lower()
+        self._eid_lc[entity_id] = entity_id.lower()
+        
+    def _apply_state(self, entity_id: str, entity: Optional[Dict[str, Any]]):
+        """
+        Store a new entity state in the caches, or drop the entity if it was removed.
+        
+        Args:
+            entity_id: Entity ID
+            entity: New entity object, or None if the entity was removed
+        """
+        with self._cache_lock:
+            self._entities_list = None
+            if entity is not None:
+                self._missing.pop(entity_id, None)
+                self.entities_cache[entity_id] = entity
+                self.states_cache[entity_id] = entity["state"]
+                self._index_entity(entity)
+                return
+                
+            self.entities_cache.pop(entity_id, None)
+            self.states_cache.pop(entity_id, None)
+            self._name_lc.pop(entity_id, None)
+            self._eid_lc.pop(entity_id, None)
+            self._by_domain.get(entity_id.partition(".")[0], {}).pop(entity_id, None)
             
-    def find_entities(self, domain: str, name_filter: str) -> List[Dict[str, Any]]:
+    def find_entities(self, domain: Union[str, Tuple[str, ...]], name_filter: str) -> List[Dict[str, Any]]:
         """
         Find entities by domain and name filter.
         
         Args:
-            domain: Entity domain (light, switch, etc.)
+            domain: Entity domain (light, switch, etc.), or tuple of domains
             name_filter: String to filter entity names
             
         Returns:
             List of matching entities
         """
         try:
-            # Refresh entities if cache is empty
-            if not self.entities_cache:
+            # Refresh entities if cache is empty or stale
+            if not self._is_fresh():
                 self.get_entities()
                 
-            # Filter entities by domain and name
+            # Filter entities by domain and name, scanning only the domain buckets
             matching_entities = []
             name_filter_lower = name_filter.lower()
+            domains = (domain,) if isinstance(domain, str) else domain
             
-            for entity_id, entity in self.entities_cache.items():
-                if entity_id.startswith(f"{domain}."):
-                    # Check friendly name in attributes
-                    attributes = entity.get("attributes", {})
-                    friendly_name = attributes.get("friendly_name", "").lower()
-                    
-                    # Match if name filter is empty or if it's in the friendly name or entity ID
-                    if not name_filter or name_filter_lower in friendly_name or name_filter_lower in entity_id.lower():
-                        matching_entities.append(entity)
-            
+            with self._cache_lock:
+                # Bound under the lock, since a full refresh replaces these dicts
+                name_lc = self._name_lc
+                eid_lc = self._eid_lc
+                get_bucket = self._by_domain.get
+                
+                for bucket_domain in domains:
+                    bucket = get_bucket(bucket_domain)
+                    if not bucket:
+                        continue
+                        
+                    # An empty name filter matches the whole domain
+                    if not name_filter:
+                        matching_entities.extend(bucket.values())
+                        continue
+                        
+                    # Otherwise match if it's in the friendly name or entity ID
+                    for entity_id, entity in bucket.items():
+                        if name_filter_lower in name_lc[entity_id] or name_filter_lower in eid_lc[entity_id]:
+                            matching_entities.append(entity)
+                        
             return matching_entities
             
         except Exception as e:
@@ -114,6 +260,13 @@ class HomeAssistantClient:
         """
         Get entity by ID.
         
+        While the state_changed subscription is connected the cache is already
+        current, so force_refresh only fetches entities that are not cached.
+        
+        Concurrent requests for the same entity share a single HTTP request,
+        and entities that were just reported as not found are not re-requested
+        until NEGATIVE_CACHE_TTL has passed.
+        
         Args:
             entity_id: Entity ID
             force_refresh: Force refresh of entity data
@@ -121,20 +274,55 @@ class HomeAssistantClient:
         Returns:
             Entity object or None if not found
         """
-        if not force_refresh and entity_id in self.entities_cache:
+        if entity_id in self.entities_cache and (not force_refresh or self._ws_connected.is_set()):
             return self.entities_cache[entity_id]
             
+        if self._missing.get(entity_id, 0.0) > time.monotonic():
+            return None
+            
+        with self._inflight_lock:
+            future = self._inflight.get(entity_id)
+            leader = future is None
+            if leader:
+                future = self._inflight[entity_id] = Future()
+                
+        if not leader:
+            return future.result()
+            
+        entity = None
+        try:
+            entity = self._fetch_entity(entity_id)
+        finally:
+            with self._inflight_lock:
+                del self._inflight[entity_id]
+            future.set_result(entity)
+            
+        return entity
+        
+    def _fetch_entity(self, entity_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Fetch one entity from Home Assistant and store it in the caches.
+        
+        Args:
+            entity_id: Entity ID
+            
+        Returns:
+            Entity object or None if not found
+        """
         try:
-            response = requests.get(f"{self.url}/api/states/{entity_id}", headers=self.headers)
+            response = self.session.get(f"{self.url}/api/states/{entity_id}")
             
             if response.status_code == 200:
-                entity = response.json()
+                entity = orjson.loads(response.content)
                 
                 # Update cache
-                self.entities_cache[entity_id] = entity
-                self.states_cache[entity_id] = entity["state"]
+                self._apply_state(entity_id, entity)
                 
                 return entity
+            elif response.status_code == 404:
+                self._missing[entity_id] = time.monotonic() + self.NEGATIVE_CACHE_TTL
+                logger.error(f"Entity {entity_id} not found")
+                return None
             else:
                 logger.error(f"Failed to get entity {entity_id}: {response.status_code}")
                 return None
@@ -213,22 +401,21 @@ class HomeAssistantClient:
             
         try:
             service_url = f"{self.url}/api/services/{domain}/{service}"
-            response = requests.post(
+            # The session already sends Content-Type: application/json
+            response = self.session.post(
                 service_url,
-                headers=self.headers,
-                json=service_data
+                data=orjson.dumps(service_data)
             )
             
             if response.status_code in [200, 201]:
-                # Force refresh affected entities
-                if "entity_id" in service_data:
+                # Force refresh affected entities, unless state_changed events will update them
+                if "entity_id" in service_data and not self._ws_connected.is_set():
                     entity_ids = service_data["entity_id"]
                     if isinstance(entity_ids, str):
                         entity_ids = [entity_ids]
-                    
-                    for entity_id in entity_ids:
-                        self.get_entity(entity_id, force_refresh=True)
                         
+                    self._refresh_entities(entity_ids)
+                    
                 return True
             else:
                 logger.error(f"Failed to call service {domain}.{service}: {response.status_code}")
@@ -238,28 +425,204 @@ class HomeAssistantClient:
             logger.error(f"Error calling service {domain}.{service}: {e}")
             return False
             
-    def get_camera_image(self, camera_entity_id: str) -> Optional[bytes]:
+    def _refresh_entities(self, entity_ids: List[str]):
+        """
+        Refresh cached entities after a service call changed them.
+        
+        Large groups are refreshed with a single /api/states request; a few
+        entities are fetched concurrently.
+        
+        Args:
+            entity_ids: IDs of the affected entities
+        """
+        entity_ids = list(dict.fromkeys(entity_ids))
+        
+        if len(entity_ids) > self.BULK_REFRESH_THRESHOLD:
+            self.get_entities(force_refresh=True)
+        elif len(entity_ids) == 1:
+            self.get_entity(entity_ids[0], force_refresh=True)
+        else:
+            list(self._refresh_executor.map(
+                lambda entity_id: self.get_entity(entity_id, force_refresh=True), entity_ids
+            ))
+            
+    def _camera_buffer(self, camera_entity_id: str, size: int) -> bytearray:
+        """
+        Get the reusable receive buffer for a camera, at least size bytes long.
+        
+        A buffer that is too small is replaced rather than resized, since
+        callers may still hold a view of it.
+        
+        Args:
+            camera_entity_id: Camera entity ID
+            size: Minimum buffer size in bytes
+            
+        Returns:
+            Receive buffer
+        """
+        buf = self._cam_bufs.get(camera_entity_id)
+        if buf is None or len(buf) < size:
+            buf = self._cam_bufs[camera_entity_id] = bytearray(size)
+        return buf
+        
+    def get_camera_image(self, camera_entity_id: str) -> Optional[memoryview]:
         """
         Get image from camera entity.
         
+        The image is streamed into a buffer kept per camera and reused by
+        later snapshots, so polling a camera does not allocate a new image
+        buffer each time. The returned view is only valid until the next call
+        for the same camera; use bytes() on it to keep a copy.
+        
         Args:
             camera_entity_id: Camera entity ID
             
         Returns:
-            Image data as bytes or None if failed
+            Image data or None if failed
         """
         try:
-            response = requests.get(
+            with self.session.get(
                 f"{self.url}/api/camera_proxy/{camera_entity_id}",
-                headers=self.headers
-            )
-            
-            if response.status_code == 200:
-                return response.content
-            else:
-                logger.error(f"Failed to get camera image: {response.status_code}")
-                return None
+                stream=True
+            ) as response:
+                if response.status_code != 200:
+                    logger.error(f"Failed to get camera image: {response.status_code}")
+                    return None
+                    
+                content_length = response.headers.get("Content-Length")
+                
+                # Read an unencoded body of known size straight into the buffer
+                if content_length and "Content-Encoding" not in response.headers:
+                    size = int(content_length)
+                    view = memoryview(self._camera_buffer(camera_entity_id, size))
+                    received = 0
+                    while received < size:
+                        count = response.raw.readinto(view[received:size])
+                        if not count:
+                            break
+                        received += count
+                    return view[:received]
+                    
+                buf = self._camera_buffer(camera_entity_id, 65536)
+                received = 0
+                for chunk in response.iter_content(chunk_size=65536):
+                    end = received + len(chunk)
+                    if end > len(buf):
+                        grown = bytearray(max(end, 2 * len(buf)))
+                        grown[:received] = buf[:received]
+                        buf = self._cam_bufs[camera_entity_id] = grown
+                    buf[received:end] = chunk
+                    received = end
+                return memoryview(buf)[:received]
                 
         except Exception as e:
             logger.error(f"Error getting camera image: {e}")
             return None
+            
+    def _start_state_subscription(self):
+        """Start the background thread that follows state_changed events."""
+        if self._ws_thread is not None and self._ws_thread.is_alive():
+            return
+            
+        self._ws_thread = threading.Thread(
+            target=self._run_state_subscription, name="ha-websocket", daemon=True
+        )
+        self._ws_thread.start()
+        
+    def _run_state_subscription(self):
+        """Run the websocket listener on this thread's own event loop."""
+        loop = asyncio.new_event_loop()
+        self._ws_loop = loop
+        try:
+            self._ws_task = loop.create_task(self._follow_state_changes())
+            loop.run_until_complete(self._ws_task)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self._ws_connected.clear()
+            loop.close()
+            self._ws_loop = None
+            
+    async def _follow_state_changes(self):
+        """
+        Subscribe to state_changed events and apply them to the caches,
+        reconnecting with exponential backoff when the connection drops.
+        """
+        delay = 1.0
+        
+        while True:
+            try:
+                async with websockets.connect(self.ws_url, max_size=None) as ws:
+                    if not await self._subscribe_state_changes(ws):
+                        return
+                        
+                    # Pick up anything that changed before the subscription
+                    # started, both since initialize() listed the states and
+                    # while a previous connection was down
+                    await asyncio.get_running_loop().run_in_executor(
+                        None, lambda: self.get_entities(force_refresh=True)
+                    )
+                        
+                    self._ws_connected.set()
+                    logger.info("Subscribed to Home Assistant state changes")
+                    delay = 1.0
+                    
+                    async for message in ws:
+                        event = orjson.loads(message)
+                        if event.get("type") != "event":
+                            continue
+                            
+                        data = event["event"]["data"]
+                        self._apply_state(data["entity_id"], data.get("new_state"))
+                        
+            except Exception as e:
+                logger.warning(f"Home Assistant websocket error: {e}")
+                
+            # Fall back to HTTP refreshes until the subscription is back
+            self._ws_connected.clear()
+            logger.info(f"Reconnecting to Home Assistant websocket in {delay:g}s")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.WS_RECONNECT_MAX_DELAY)
+            
+    async def _subscribe_state_changes(self, ws) -> bool:
+        """
+        Authenticate a websocket connection and subscribe it to state_changed events.
+        
+        Args:
+            ws: Open websocket connection
+            
+        Returns:
+            True if subscribed, False if authentication was rejected
+        """
+        await ws.recv()  # auth_required
+        await ws.send(orjson.dumps({"type": "auth", "access_token": self.token}).decode())
+        
+        auth = orjson.loads(await ws.recv())
+        if auth.get("type") != "auth_ok":
+            logger.error(f"Home Assistant websocket authentication failed: {auth.get('message', auth.get('type'))}")
+            return False
+            
+        await ws.send(orjson.dumps(
+            {"id": 1, "type": "subscribe_events", "event_type": "state_changed"}
+        ).decode())
+        result = orjson.loads(await ws.recv())
+        if not result.get("success"):
+            raise RuntimeError(f"subscribe_events failed: {result.get('error')}")
+            
+        return True
+        
+    def close(self):
+        """Stop the state subscription and release HTTP connections and threads."""
+        loop, task = self._ws_loop, self._ws_task
+        if loop is not None and task is not None:
+            try:
+                loop.call_soon_threadsafe(task.cancel)
+            except RuntimeError:
+                pass  # loop already closed
+                
+        if self._ws_thread is not None:
+            self._ws_thread.join(timeout=2)
+            self._ws_thread = None
+            
+        self._refresh_executor.shutdown(wait=False)
+        self.session.close()
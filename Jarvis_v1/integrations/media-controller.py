@@ -1,11 +1,62 @@
-import mpd
-import spotipy
-from spotipy.oauth2 import SpotifyOAuth
-from typing import Dict, List, Any, Optional, Union
+from __future__ import annotations
+
+import time
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import TYPE_CHECKING, Dict, Iterator, List, Any, Optional, Tuple, Union
 from loguru import logger
 
 from config.settings import settings
 
+# The client libraries are imported where a backend is first used, so an
+# unconfigured backend never loads
+if TYPE_CHECKING:
+    import mpd
+    import spotipy
+
+
+# Spotify searches in priority order: the arguments a search needs, its query
+# template, the item type searched for and the start_playback argument the
+# top result's URI is passed as
+_SPOTIFY_SEARCH_PLANS = (
+    (("artist", "track"), "artist:{artist} track:{track}", "track", "uris"),
+    (("artist", "album"), "artist:{artist} album:{album}", "album", "context_uri"),
+    (("artist",), "{artist}", "artist", "context_uri"),
+    (("playlist",), "{playlist}", "playlist", "context_uri"),
+    (("genre",), "genre:{genre}", "playlist", "context_uri"),
+)
+
+
+class _SpotifyRetry(Retry):
+    """
+    Retry policy for Spotify API requests.
+    Waits as long as a rate-limited response's Retry-After asks, but never
+    more than MAX_RETRY_AFTER seconds, so a long rate limit fails the command
+    instead of stalling it. Errors and gateway responses are only retried for
+    idempotent methods: a 502/503 on POST (next/previous track) may arrive
+    after Spotify applied the command. A 429 is retried for any method, as
+    rate-limited requests are rejected before they are applied.
+    """
+    
+    MAX_RETRY_AFTER = 10.0
+    
+    def is_retry(self, method: str, status_code: int, has_retry_after: bool = False) -> bool:
+        if status_code == 429 and self.status_forcelist and 429 in self.status_forcelist:
+            return True
+        return super().is_retry(method, status_code, has_retry_after)
+        
+    def get_retry_after(self, response) -> Optional[float]:
+        retry_after = super().get_retry_after(response)
+        if retry_after is None:
+            return None
+        return min(retry_after, self.MAX_RETRY_AFTER)
+
 
 class MediaController:
     """
@@ -13,65 +64,199 @@ class MediaController:
     Provides methods to control music playback.
     """
     
+    # Seconds a looked-up Spotify playback device is reused before asking again
+    SPOTIFY_DEVICE_TTL = 30.0
+    
+    # Spotify search results kept, and for how many seconds (Spotify allows caching
+    # search responses for about two minutes)
+    SEARCH_CACHE_SIZE = 256
+    SEARCH_CACHE_TTL = 120.0
+    
+    # Seconds playback state (Spotify current playback, MPD status and current
+    # song) is reused by read-only calls; player commands drop it immediately
+    PLAYBACK_CACHE_TTL = 1.0
+    
+    # Read-only MPD commands whose results _mpd_read reuses
+    MPD_CACHED_READS = frozenset(["status", "currentsong"])
+    
+    # Seconds of inactivity after which the MPD connection is pinged before use
+    MPD_IDLE_PING = 30.0
+    
+    # Socket timeout for MPD commands, in seconds
+    MPD_TIMEOUT = 10
+    
+    # Seconds the list of stored MPD playlists is reused before asking again
+    PLAYLIST_CACHE_TTL = 30.0
+    
+    # Volume restored on unmute when the volume before muting is unknown
+    DEFAULT_VOLUME = 50
+    
     def __init__(self):
         self.mpd_client = None
-        self.spotify_client = None
+        self._spotify_client = None
+        self._spotify_init_done = False
+        self._spotify_lock = threading.Lock()
         self.mpd_host = settings.media.mpd_host
         self.mpd_port = settings.media.mpd_port
         self.spotify_client_id = settings.media.spotify_client_id
         self.spotify_client_secret = settings.media.spotify_client_secret
         self.spotify_redirect_uri = settings.media.spotify_redirect_uri
+        self.spotify_cache_path = settings.media.spotify_cache_path
+        
+        # When the MPD connection was last used successfully (time.monotonic())
+        self._mpd_last_use = 0.0
+        
+        # (fetch time, result) of the cached playback state queries
+        self._playback_cache: Tuple[float, Any] = (0.0, None)
+        self._mpd_read_cache: Dict[str, Tuple[float, Any]] = {}
+        
+        # Stored MPD playlist names, their case-folded forms and when they were listed
+        self._playlist_names: frozenset = frozenset()
+        self._playlist_folded: List[Tuple[str, str]] = []
+        self._playlist_ts = 0.0
+        
+        # Thread for querying Spotify while MPD is queried; started on first use
+        self._spotify_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="spotify")
+        
+        # Top Spotify search result URI and lookup time per (query, type), least recently used first
+        self._search_cache: "OrderedDict[Tuple[str, str], Tuple[float, str]]" = OrderedDict()
+        self._search_lock = threading.Lock()
+        
+        # Spotify device used for playback and when it was looked up (time.monotonic())
+        self._spotify_device_id: Optional[str] = None
+        self._spotify_device_ts = 0.0
+        
+        # Volume each backend had before set_mute muted it, if known
+        self._mpd_volume_before_mute: Optional[int] = None
+        self._spotify_volume_before_mute: Optional[int] = None
         
     def initialize(self) -> bool:
-        """Initialize media clients."""
-        success = True
+        """
+        Initialize media clients.
         
-        # Initialize MPD client
-        if self.mpd_host and self.mpd_port:
-            try:
-                self.mpd_client = mpd.MPDClient()
-                self.mpd_client.connect(self.mpd_host, self.mpd_port)
-                logger.info(f"Connected to MPD server at {self.mpd_host}:{self.mpd_port}")
-            except Exception as e:
-                logger.error(f"Failed to connect to MPD server: {e}")
-                self.mpd_client = None
-                success = False
-                
-        # Initialize Spotify client
-        if self.spotify_client_id and self.spotify_client_secret and self.spotify_redirect_uri:
-            try:
-                auth_manager = SpotifyOAuth(
-                    client_id=self.spotify_client_id,
-                    client_secret=self.spotify_client_secret,
-                    redirect_uri=self.spotify_redirect_uri,
-                    scope="user-read-playback-state,user-modify-playback-state"
+        Only MPD is connected here; the Spotify client is created on first use.
+        """
+        return self._init_mpd()
+        
+    def _init_mpd(self) -> bool:
+        """Connect to the MPD server if one is configured."""
+        if not (self.mpd_host and self.mpd_port):
+            return True
+            
+        try:
+            self.mpd_client = self._open_mpd()
+            logger.info(f"Connected to MPD server at {self.mpd_host}:{self.mpd_port}")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to connect to MPD server: {e}")
+            self.mpd_client = None
+            return False
+            
+    @property
+    def spotify_client(self) -> Optional[spotipy.Spotify]:
+        """Spotify client, created on first use; None if Spotify is not configured or failed."""
+        if not self._spotify_init_done:
+            with self._spotify_lock:
+                if not self._spotify_init_done:
+                    self._spotify_client = self._init_spotify()
+                    self._spotify_init_done = True
+                    
+        return self._spotify_client
+        
+    def _init_spotify(self) -> Optional[spotipy.Spotify]:
+        """
+        Create the Spotify client if Spotify is configured.
+        
+        Tokens are persisted to spotify_cache_path, so after the first
+        authorization the client refreshes them without user interaction.
+        
+        Returns:
+            Spotify client or None
+        """
+        if not (self.spotify_client_id and self.spotify_client_secret and self.spotify_redirect_uri):
+            return None
+            
+        try:
+            import spotipy
+            from spotipy.cache_handler import CacheFileHandler
+            from spotipy.oauth2 import SpotifyOAuth
+            
+            # One pooled session for the API and token refreshes, retrying rate
+            # limits and transient gateway errors with backoff (Retry-After is honored,
+            # up to _SpotifyRetry.MAX_RETRY_AFTER seconds)
+            session = requests.Session()
+            session.mount("https://", HTTPAdapter(
+                pool_connections=4,
+                pool_maxsize=8,
+                max_retries=_SpotifyRetry(
+                    total=3,
+                    backoff_factor=0.5,
+                    status_forcelist=(429, 502, 503),
+                    allowed_methods=frozenset(["GET", "PUT", "DELETE"])
                 )
-                self.spotify_client = spotipy.Spotify(auth_manager=auth_manager)
-                logger.info("Spotify client initialized")
-            except Exception as e:
-                logger.error(f"Failed to initialize Spotify client: {e}")
-                self.spotify_client = None
-                success = False
-                
-        return success
-    
+            ))
+            
+            auth_manager = SpotifyOAuth(
+                client_id=self.spotify_client_id,
+                client_secret=self.spotify_client_secret,
+                redirect_uri=self.spotify_redirect_uri,
+                scope="user-read-playback-state,user-modify-playback-state",
+                cache_handler=CacheFileHandler(cache_path=self.spotify_cache_path),
+                open_browser=False,
+                requests_session=session
+            )
+            client = spotipy.Spotify(auth_manager=auth_manager, requests_session=session)
+            logger.info("Spotify client initialized")
+            return client
+        except Exception as e:
+            logger.error(f"Failed to initialize Spotify client: {e}")
+            return None
+            
     # MPD control methods
+    def _open_mpd(self) -> mpd.MPDClient:
+        """Open a new long-lived MPD connection."""
+        import mpd
+        
+        client = mpd.MPDClient()
+        client.timeout = self.MPD_TIMEOUT
+        client.idletimeout = None
+        client.connect(self.mpd_host, self.mpd_port)
+        self._mpd_last_use = time.monotonic()
+        return client
+        
+    def _close_mpd(self):
+        """Close the current MPD connection, ignoring errors from a dead socket."""
+        try:
+            self.mpd_client.disconnect()
+        except Exception:
+            pass
+            
     def connect_mpd(self) -> bool:
-        """Connect or reconnect to MPD server."""
+        """
+        Connect or reconnect to MPD server.
+        
+        The connection is kept open between calls. It is only pinged after
+        being idle for MPD_IDLE_PING seconds; a connection that fails while in
+        use is reopened by _mpd_call.
+        """
         if not self.mpd_host or not self.mpd_port:
             return False
             
         try:
             if self.mpd_client:
+                if time.monotonic() - self._mpd_last_use < self.MPD_IDLE_PING:
+                    return True
+                    
                 try:
                     self.mpd_client.ping()  # Check if connection is still alive
+                    self._mpd_last_use = time.monotonic()
                     return True
                 except Exception:
                     # Connection lost, reconnect
-                    self.mpd_client = mpd.MPDClient()
+                    self._close_mpd()
                     
             # Connect to MPD
-            self.mpd_client.connect(self.mpd_host, self.mpd_port)
+            self.mpd_client = self._open_mpd()
             return True
             
         except Exception as e:
@@ -79,6 +264,86 @@ class MediaController:
             self.mpd_client = None
             return False
             
+    @contextmanager
+    def _mpd(self) -> Iterator[mpd.MPDClient]:
+        """
+        Validate the MPD connection once for a block of several commands.
+        
+        Commands issued on the yielded client skip the per-command connection
+        check of _mpd_call. A connection error inside the block closes the
+        connection so the next use reopens it.
+        
+        Yields:
+            Connected MPD client
+        """
+        import mpd
+        
+        if not self.connect_mpd():
+            raise mpd.ConnectionError("Not connected to MPD server")
+            
+        try:
+            yield self.mpd_client
+        except (mpd.ConnectionError, OSError):
+            self._close_mpd()
+            self._mpd_last_use = 0.0
+            raise
+        finally:
+            # The block may have changed what status and currentsong report
+            self._mpd_read_cache.clear()
+            
+        self._mpd_last_use = time.monotonic()
+        
+    def _mpd_call(self, command: str, *args) -> Any:
+        """
+        Run an MPD command on the persistent connection, reconnecting and
+        retrying once if the connection turns out to be closed.
+        
+        Args:
+            command: MPD command name
+            *args: Command arguments
+            
+        Returns:
+            Command result
+        """
+        import mpd
+        
+        if not self.connect_mpd():
+            raise mpd.ConnectionError("Not connected to MPD server")
+            
+        try:
+            result = getattr(self.mpd_client, command)(*args)
+        except (mpd.ConnectionError, OSError):
+            self._close_mpd()
+            self._mpd_last_use = 0.0
+            self.mpd_client = self._open_mpd()
+            result = getattr(self.mpd_client, command)(*args)
+            
+        self._mpd_last_use = time.monotonic()
+        
+        # Any other command may change what status and currentsong report
+        if command not in self.MPD_CACHED_READS:
+            self._mpd_read_cache.clear()
+            
+        return result
+        
+    def _mpd_read(self, command: str) -> Any:
+        """
+        Run a read-only MPD command, reusing its result for PLAYBACK_CACHE_TTL seconds.
+        
+        Args:
+            command: "status" or "currentsong"
+            
+        Returns:
+            Command result
+        """
+        cached = self._mpd_read_cache.get(command)
+        if cached is not None and time.monotonic() - cached[0] < self.PLAYBACK_CACHE_TTL:
+            return cached[1]
+            
+        result = self._mpd_call(command)
+        self._mpd_read_cache[command] = (time.monotonic(), result)
+        return result
+        
     def play_mpd(self, artist: str = None, album: str = None, title: str = None, 
                 genre: str = None, playlist: str = None) -> bool:
         """
@@ -98,60 +363,194 @@ class MediaController:
             return False
             
         try:
-            # Clear current playlist
-            self.mpd_client.clear()
-            
-            if playlist:
-                # Play specific playlist
-                playlists = self.mpd_client.listplaylists()
-                playlist_names = [p["playlist"] for p in playlists]
+            with self._mpd() as client:
+                # Clear current playlist
+                client.clear()
                 
-                if playlist in playlist_names:
-                    self.mpd_client.load(playlist)
-                else:
-                    # Try partial match
-                    matches = [p for p in playlist_names if playlist.lower() in p.lower()]
-                    if matches:
-                        self.mpd_client.load(matches[0])
-                    else:
+                if playlist:
+                    # Play specific playlist
+                    name = self._find_playlist(client, playlist)
+                    if name is None:
                         logger.warning(f"Playlist '{playlist}' not found")
                         return False
-                        
-            else:
-                # Build search query
-                search_terms = {}
-                if artist:
-                    search_terms["artist"] = artist
-                if album:
-                    search_terms["album"] = album
-                if title:
-                    search_terms["title"] = title
-                if genre:
-                    search_terms["genre"] = genre
-                    
-                if not search_terms:
-                    # If no search terms, add some random tracks
-                    self.mpd_client.add("")
+                    client.load(name)
+                            
                 else:
-                    # Perform search and add results to playlist
-                    results = self.mpd_client.search(**search_terms)
-                    
-                    if not results:
-                        logger.warning(f"No results found for search: {search_terms}")
-                        return False
+                    # Build search query
+                    search_terms = {}
+                    if artist:
+                        search_terms["artist"] = artist
+                    if album:
+                        search_terms["album"] = album
+                    if title:
+                        search_terms["title"] = title
+                    if genre:
+                        search_terms["genre"] = genre
                         
-                    for song in results:
-                        self.mpd_client.add(song["file"])
+                    if not search_terms:
+                        # If no search terms, add some random tracks
+                        client.add("")
+                    else:
+                        # Search and queue the matches on the server in a single command
+                        # list, so neither the file list nor one add per song crosses
+                        # the connection; the trailing status reports how many were added
+                        query = [value for term in search_terms.items() for value in term]
+                        client.command_list_ok_begin()
+                        client.searchadd(*query)
+                        client.status()
+                        status = client.command_list_end()[-1]
                         
-            # Start playback
-            self.mpd_client.play()
-            return True
-            
+                        if int(status.get("playlistlength", 0)) == 0:
+                            logger.warning(f"No results found for search: {search_terms}")
+                            return False
+                            
+                # Start playback
+                client.play()
+                return True
+                
         except Exception as e:
             logger.error(f"Error playing music on MPD: {e}")
             return False
             
+    def _find_playlist(self, client: mpd.MPDClient, playlist: str) -> Optional[str]:
+        """
+        Resolve a playlist name against the stored MPD playlists.
+        
+        The playlist list is cached for PLAYLIST_CACHE_TTL seconds and listed
+        again before giving up on a name that is not in the cached copy.
+        
+        Args:
+            client: Connected MPD client
+            playlist: Exact playlist name or part of one
+            
+        Returns:
+            Matching playlist name, or None if no playlist matches
+        """
+        needle = playlist.casefold()
+        fresh = time.monotonic() - self._playlist_ts < self.PLAYLIST_CACHE_TTL
+        
+        for refresh in ((False, True) if fresh else (True,)):
+            if refresh:
+                names = list(map(itemgetter("playlist"), client.listplaylists()))
+                self._playlist_names = frozenset(names)
+                self._playlist_folded = [(name.casefold(), name) for name in names]
+                self._playlist_ts = time.monotonic()
+                
+            if playlist in self._playlist_names:
+                return playlist
+                
+            # Try partial match, ignoring case (including Unicode case folding)
+            for folded, name in self._playlist_folded:
+                if needle in folded:
+                    return name
+                    
+        return None
+        
     # Spotify control methods
+    def _get_device_id(self) -> Optional[str]:
+        """
+        Get the Spotify device to play on, cached for SPOTIFY_DEVICE_TTL seconds.
+        
+        Returns:
+            First active device ID, the first device ID if none are active, or None
+        """
+        if self._spotify_device_id and time.monotonic() - self._spotify_device_ts < self.SPOTIFY_DEVICE_TTL:
+            return self._spotify_device_id
+            
+        devices = self.spotify_client.devices()
+        if not devices or not devices.get("devices"):
+            self._spotify_device_id = None
+            return None
+            
+        # Use the first active device or the first device if none are active
+        active_devices = [d for d in devices["devices"] if d["is_active"]]
+        target_device = active_devices[0] if active_devices else devices["devices"][0]
+        
+        self._spotify_device_id = target_device["id"]
+        self._spotify_device_ts = time.monotonic()
+        return self._spotify_device_id
+        
+    def _current_playback(self) -> Optional[Dict[str, Any]]:
+        """Get Spotify's current playback state, reusing it for PLAYBACK_CACHE_TTL seconds."""
+        fetched_at, playback = self._playback_cache
+        if time.monotonic() - fetched_at < self.PLAYBACK_CACHE_TTL:
+            return playback
+            
+        playback = self.spotify_client.current_playback()
+        self._playback_cache = (time.monotonic(), playback)
+        return playback
+        
+    def _spotify_control(self, method: str, *args, **kwargs) -> Any:
+        """
+        Run a Spotify player command and drop the cached playback state.
+        
+        Args:
+            method: Spotify client method name
+            *args: Positional arguments
+            **kwargs: Keyword arguments
+            
+        Returns:
+            Method result
+        """
+        try:
+            return getattr(self.spotify_client, method)(*args, **kwargs)
+        finally:
+            self._playback_cache = (0.0, None)
+            
+    def _start_playback(self, **kwargs):
+        """
+        Start Spotify playback on the cached device, looking the device up
+        again and retrying once if Spotify no longer knows it.
+        
+        Args:
+            **kwargs: Playback arguments (uris or context_uri)
+        """
+        import spotipy
+        
+        try:
+            self._spotify_control("start_playback", device_id=self._get_device_id(), **kwargs)
+        except spotipy.SpotifyException as e:
+            if e.http_status != 404:
+                raise
+                
+            # Device went away; drop the cached one and retry with a fresh lookup
+            self._spotify_device_id = None
+            self._spotify_control("start_playback", device_id=self._get_device_id(), **kwargs)
+            
+    def _search_uri(self, query: str, search_type: str) -> Optional[str]:
+        """
+        Get the URI of the top Spotify search result, cached per query and type.
+        
+        Args:
+            query: Search query
+            search_type: Item type (track, album, artist, playlist)
+            
+        Returns:
+            URI of the first result or None if nothing was found
+        """
+        key = (query, search_type)
+        now = time.monotonic()
+        
+        with self._search_lock:
+            cached = self._search_cache.get(key)
+            if cached is not None and now - cached[0] < self.SEARCH_CACHE_TTL:
+                self._search_cache.move_to_end(key)
+                return cached[1]
+                
+        results = self.spotify_client.search(query, type=search_type, limit=1)
+        items = results[f"{search_type}s"]["items"] if results else None
+        if not items:
+            return None
+            
+        uri = items[0]["uri"]
+        with self._search_lock:
+            self._search_cache[key] = (now, uri)
+            self._search_cache.move_to_end(key)
+            if len(self._search_cache) > self.SEARCH_CACHE_SIZE:
+                self._search_cache.popitem(last=False)
+                
+        return uri
+        
     def play_spotify(self, artist: str = None, album: str = None, track: str = None,
                    playlist: str = None, genre: str = None) -> bool:
         """
@@ -171,64 +570,23 @@ class MediaController:
             return False
             
         try:
-            # Get available devices
-            devices = self.spotify_client.devices()
-            if not devices or not devices.get("devices"):
+            # Get the device to play on
+            if not self._get_device_id():
                 logger.warning("No Spotify devices available")
                 return False
                 
-            # Use the first active device or the first device if none are active
-            active_devices = [d for d in devices["devices"] if d["is_active"]]
-            target_device = active_devices[0] if active_devices else devices["devices"][0]
-            device_id = target_device["id"]
-            
-            if artist and track:
-                # Search for specific track
-                query = f"artist:{artist} track:{track}"
-                results = self.spotify_client.search(query, type="track", limit=1)
-                
-                if results and results["tracks"]["items"]:
-                    track_uri = results["tracks"]["items"][0]["uri"]
-                    self.spotify_client.start_playback(device_id=device_id, uris=[track_uri])
-                    return True
-                    
-            elif artist and album:
-                # Search for album
-                query = f"artist:{artist} album:{album}"
-                results = self.spotify_client.search(query, type="album", limit=1)
-                
-                if results and results["albums"]["items"]:
-                    album_uri = results["albums"]["items"][0]["uri"]
-                    self.spotify_client.start_playback(device_id=device_id, context_uri=album_uri)
-                    return True
-                    
-            elif artist:
-                # Search for artist
-                results = self.spotify_client.search(artist, type="artist", limit=1)
-                
-                if results and results["artists"]["items"]:
-                    artist_uri = results["artists"]["items"][0]["uri"]
-                    self.spotify_client.start_playback(device_id=device_id, context_uri=artist_uri)
-                    return True
+            # Use the first search plan whose arguments were all given
+            terms = {"artist": artist, "album": album, "track": track, "playlist": playlist, "genre": genre}
+            for required, template, search_type, playback_arg in _SPOTIFY_SEARCH_PLANS:
+                if not all(terms[name] for name in required):
+                    continue
                     
-            elif playlist:
-                # Search for playlist
-                results = self.spotify_client.search(playlist, type="playlist", limit=1)
-                
-                if results and results["playlists"]["items"]:
-                    playlist_uri = results["playlists"]["items"][0]["uri"]
-                    self.spotify_client.start_playback(device_id=device_id, context_uri=playlist_uri)
+                uri = self._search_uri(template.format(**terms), search_type)
+                if uri:
+                    self._start_playback(**{playback_arg: [uri] if playback_arg == "uris" else uri})
                     return True
-                    
-            elif genre:
-                # Search for genre playlist
-                results = self.spotify_client.search(f"genre:{genre}", type="playlist", limit=1)
+                break
                 
-                if results and results["playlists"]["items"]:
-                    playlist_uri = results["playlists"]["items"][0]["uri"]
-                    self.spotify_client.start_playback(device_id=device_id, context_uri=playlist_uri)
-                    return True
-                    
             logger.warning(f"No Spotify results found for query")
             return False
             
@@ -241,15 +599,14 @@ class MediaController:
         """Pause playback."""
         if self.mpd_client:
             try:
-                self.connect_mpd()
-                self.mpd_client.pause(1)
+                self._mpd_call("pause", 1)
                 return True
             except Exception as e:
                 logger.error(f"Error pausing MPD: {e}")
                 
         if self.spotify_client:
             try:
-                self.spotify_client.pause_playback()
+                self._spotify_control("pause_playback")
                 return True
             except Exception as e:
                 logger.error(f"Error pausing Spotify: {e}")
@@ -260,15 +617,14 @@ class MediaController:
         """Resume playback."""
         if self.mpd_client:
             try:
-                self.connect_mpd()
-                self.mpd_client.pause(0)  # Un-pause
+                self._mpd_call("pause", 0)  # Un-pause
                 return True
             except Exception as e:
                 logger.error(f"Error resuming MPD: {e}")
                 
         if self.spotify_client:
             try:
-                self.spotify_client.start_playback()
+                self._spotify_control("start_playback")
                 return True
             except Exception as e:
                 logger.error(f"Error resuming Spotify: {e}")
@@ -279,15 +635,14 @@ class MediaController:
         """Skip to next track."""
         if self.mpd_client:
             try:
-                self.connect_mpd()
-                self.mpd_client.next()
+                self._mpd_call("next")
                 return True
             except Exception as e:
                 logger.error(f"Error skipping to next track on MPD: {e}")
                 
         if self.spotify_client:
             try:
-                self.spotify_client.next_track()
+                self._spotify_control("next_track")
                 return True
             except Exception as e:
                 logger.error(f"Error skipping to next track on Spotify: {e}")
@@ -298,15 +653,14 @@ class MediaController:
         """Go to previous track."""
         if self.mpd_client:
             try:
-                self.connect_mpd()
-                self.mpd_client.previous()
+                self._mpd_call("previous")
                 return True
             except Exception as e:
                 logger.error(f"Error going to previous track on MPD: {e}")
                 
         if self.spotify_client:
             try:
-                self.spotify_client.previous_track()
+                self._spotify_control("previous_track")
                 return True
             except Exception as e:
                 logger.error(f"Error going to previous track on Spotify: {e}")
@@ -317,8 +671,7 @@ class MediaController:
         """Get current volume level (0-100)."""
         if self.mpd_client:
             try:
-                self.connect_mpd()
-                status = self.mpd_client.status()
+                status = self._mpd_read("status")
                 if "volume" in status:
                     return int(status["volume"])
             except Exception as e:
@@ -326,7 +679,7 @@ class MediaController:
                 
         if self.spotify_client:
             try:
-                playback = self.spotify_client.current_playback()
+                playback = self._current_playback()
                 if playback and "device" in playback:
                     return playback["device"]["volume_percent"]
             except Exception as e:
@@ -349,15 +702,14 @@ class MediaController:
         
         if self.mpd_client:
             try:
-                self.connect_mpd()
-                self.mpd_client.setvol(level)
+                self._mpd_call("setvol", level)
                 return True
             except Exception as e:
                 logger.error(f"Error setting MPD volume: {e}")
                 
         if self.spotify_client:
             try:
-                self.spotify_client.volume(level)
+                self._spotify_control("volume", level)
                 return True
             except Exception as e:
                 logger.error(f"Error setting Spotify volume: {e}")
@@ -376,19 +728,17 @@ class MediaController:
         """
         if self.mpd_client:
             try:
-                self.connect_mpd()
-                if mute:
-                    # Store current volume in client instance
-                    status = self.mpd_client.status()
-                    if "volume" in status:
-                        self._mpd_volume_before_mute = int(status["volume"])
-                    self.mpd_client.setvol(0)
-                else:
-                    # Restore previous volume
-                    if hasattr(self, "_mpd_volume_before_mute"):
-                        self.mpd_client.setvol(self._mpd_volume_before_mute)
+                with self._mpd() as client:
+                    if mute:
+                        # Store current volume in client instance
+                        status = client.status()
+                        if "volume" in status:
+                            self._mpd_volume_before_mute = int(status["volume"])
+                        client.setvol(0)
                     else:
-                        self.mpd_client.setvol(50)  # Default volume
+                        # Restore previous volume
+                        volume = self._mpd_volume_before_mute
+                        client.setvol(volume if volume is not None else self.DEFAULT_VOLUME)
                 return True
             except Exception as e:
                 logger.error(f"Error setting MPD mute: {e}")
@@ -397,16 +747,14 @@ class MediaController:
             try:
                 if mute:
                     # Store current volume in client instance
-                    playback = self.spotify_client.current_playback()
+                    playback = self._current_playback()
                     if playback and "device" in playback:
                         self._spotify_volume_before_mute = playback["device"]["volume_percent"]
-                    self.spotify_client.volume(0)
+                    self._spotify_control("volume", 0)
                 else:
                     # Restore previous volume
-                    if hasattr(self, "_spotify_volume_before_mute"):
-                        self.spotify_client.volume(self._spotify_volume_before_mute)
-                    else:
-                        self.spotify_client.volume(50)  # Default volume
+                    volume = self._spotify_volume_before_mute
+                    self._spotify_control("volume", volume if volume is not None else self.DEFAULT_VOLUME)
                 return True
             except Exception as e:
                 logger.error(f"Error setting Spotify mute: {e}")
@@ -425,15 +773,14 @@ class MediaController:
         """
         if self.mpd_client:
             try:
-                self.connect_mpd()
-                self.mpd_client.random(1 if shuffle else 0)
+                self._mpd_call("random", 1 if shuffle else 0)
                 return True
             except Exception as e:
                 logger.error(f"Error setting MPD shuffle: {e}")
                 
         if self.spotify_client:
             try:
-                self.spotify_client.shuffle(shuffle)
+                self._spotify_control("shuffle", shuffle)
                 return True
             except Exception as e:
                 logger.error(f"Error setting Spotify shuffle: {e}")
@@ -452,15 +799,14 @@ class MediaController:
         """
         if self.mpd_client:
             try:
-                self.connect_mpd()
-                self.mpd_client.repeat(1 if repeat else 0)
+                self._mpd_call("repeat", 1 if repeat else 0)
                 return True
             except Exception as e:
                 logger.error(f"Error setting MPD repeat: {e}")
                 
         if self.spotify_client:
             try:
-                self.spotify_client.repeat("context" if repeat else "off")
+                self._spotify_control("repeat", "context" if repeat else "off")
                 return True
             except Exception as e:
                 logger.error(f"Error setting Spotify repeat: {e}")
@@ -471,13 +817,20 @@ class MediaController:
         """
         Get information about the current track.
         
+        MPD's current song is preferred. When Spotify is also in use, its
+        playback state is fetched at the same time, so falling back to it
+        when MPD has nothing queued does not add a second round trip.
+        
         Returns:
             Dictionary with track information or None if not available
         """
+        spotify_playback = None
+        if self.mpd_client and self.spotify_client:
+            spotify_playback = self._spotify_executor.submit(self._current_playback)
+            
         if self.mpd_client:
             try:
-                self.connect_mpd()
-                current_song = self.mpd_client.currentsong()
+                current_song = self._mpd_read("currentsong")
                 if current_song:
                     return {
                         "title": current_song.get("title", "Unknown"),
@@ -491,10 +844,10 @@ class MediaController:
                 
         if self.spotify_client:
             try:
-                current = self.spotify_client.current_playback()
+                current = spotify_playback.result() if spotify_playback else self._current_playback()
                 if current and "item" in current:
                     item = current["item"]
-                    artists = ", ".join([artist["name"] for artist in item["artists"]])
+                    artists = ", ".join(map(itemgetter("name"), item["artists"]))
                     return {
                         "title": item["name"],
                         "artist": artists,
@@ -1,14 +1,11 @@
-import threading
+import os
 import signal
+import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from typing import Dict, List, Any, Optional, Callable
 from loguru import logger
 
-from core.audio_listener import AudioListener
-from core.command_processor import CommandProcessor
-from core.task_scheduler import TaskScheduler
-from api.server import APIServer
-
 
 class MicroservicesControlPlane:
     """
@@ -19,7 +16,15 @@ class MicroservicesControlPlane:
     def __init__(self):
         self.services = {}
         self.running = False
-        self.threads = {}
+        
+        # Worker threads for service startup and dispatched commands, created by start()
+        self.executor: Optional[ThreadPoolExecutor] = None
+        self.futures: Dict[str, Future] = {}
+        
+        # Commands being processed, by normalized text, so identical commands
+        # arriving from several sources at once are processed only once
+        self._inflight: Dict[str, Future] = {}
+        self._inflight_lock = threading.Lock()
         
         # Initialize services
         self.audio_listener = None
@@ -32,6 +37,13 @@ class MicroservicesControlPlane:
         try:
             logger.info("Initializing MCP...")
             
+            # Imported here so loading the speech and integration libraries is
+            # left to initialization instead of importing this module
+            from core.audio_listener import AudioListener
+            from core.command_processor import CommandProcessor
+            from core.task_scheduler import TaskScheduler
+            from api.server import APIServer
+            
             # Initialize audio listener
             self.audio_listener = AudioListener()
             self.services["audio_listener"] = self.audio_listener
@@ -48,8 +60,16 @@ class MicroservicesControlPlane:
             self.api_server = APIServer()
             self.services["api_server"] = self.api_server
             
-            # Cross-wire services
-            self.command_processor.initialize(self.audio_listener)
+            # Load the audio models while the command processor connects to its
+            # integrations; TTS precaching waits until the models are ready
+            with ThreadPoolExecutor(max_workers=2, thread_name_prefix="mcp-init") as executor:
+                audio_init = executor.submit(self.audio_listener.initialize)
+                
+                # Cross-wire services
+                command_init = executor.submit(self.command_processor.initialize, self.audio_listener)
+                
+                audio_init.result()
+                command_init.result()
             
             logger.info("MCP initialized successfully")
             return True
@@ -72,20 +92,17 @@ class MicroservicesControlPlane:
             signal.signal(signal.SIGINT, self._signal_handler)
             signal.signal(signal.SIGTERM, self._signal_handler)
             
-            # Start API server
-            api_thread = threading.Thread(target=self._run_api_server)
-            api_thread.daemon = True
-            api_thread.start()
-            self.threads["api_server"] = api_thread
+            # Start API server (uvicorn runs in its own thread)
+            self._run_api_server()
             
             # Start task scheduler
-            scheduler_thread = threading.Thread(target=self._run_task_scheduler)
-            scheduler_thread.daemon = True
-            scheduler_thread.start()
-            self.threads["task_scheduler"] = scheduler_thread
+            self.executor = ThreadPoolExecutor(
+                max_workers=max(4, os.cpu_count() or 1), thread_name_prefix="mcp"
+            )
+            self.futures["task_scheduler"] = self.executor.submit(self._run_task_scheduler)
             
             # Start audio listener
-            self.audio_listener.start(self.command_processor.process_command)
+            self.audio_listener.start(self.process_command)
             
             logger.info("MCP started successfully")
             return True
@@ -117,12 +134,17 @@ class MicroservicesControlPlane:
             if self.task_scheduler:
                 self.task_scheduler.stop()
                 
-            # Wait for threads to finish
-            for name, thread in self.threads.items():
-                if thread.is_alive():
-                    logger.info(f"Waiting for {name} thread to finish...")
-                    thread.join(timeout=5.0)
-                    
+            # Wait for service tasks to finish; commands already submitted still run
+            pending = [future for future in self.futures.values() if not future.done()]
+            if pending:
+                logger.info(f"Waiting for {len(pending)} service task(s) to finish...")
+                wait(pending, timeout=5.0)
+            self.futures.clear()
+            
+            if self.executor:
+                self.executor.shutdown(wait=False)
+                self.executor = None
+                
             # Cleanup resources
             self._cleanup()
             
@@ -139,25 +161,33 @@ class MicroservicesControlPlane:
         if self.audio_listener:
             self.audio_listener.cleanup()
             
+        # Clean up command processor
+        if self.command_processor:
+            self.command_processor.cleanup()
+            
         # Other cleanup as needed
         
     def _run_api_server(self):
-        """Run API server in a separate thread."""
+        """Configure and start the API server."""
         try:
-            # Configure API server with callbacks
-            self.api_server.set_command_callback(self.command_processor.process_command)
+            # Expose services to the API routes
+            self.api_server.set_services(
+                command_processor=self.command_processor,
+                task_scheduler=self.task_scheduler
+            )
             
             # Start API server
             self.api_server.start()
             
         except Exception as e:
-            logger.error(f"Error in API server thread: {e}")
+            logger.error(f"Error starting API server: {e}")
             
     def _run_task_scheduler(self):
         """Run task scheduler in a separate thread."""
         try:
-            # Configure scheduler
-            self.task_scheduler.set_command_callback(self.command_processor.process_command)
+            # Configure scheduler; scheduled commands run on the MCP worker
+            # threads, so a slow command doesn't hold a scheduler thread
+            self.task_scheduler.set_command_callback(self.submit_command)
             
             # Start scheduler
             self.task_scheduler.start()
@@ -169,6 +199,10 @@ class MicroservicesControlPlane:
         """
         Process a command through the command processor.
         
+        A command arriving while the same command (ignoring case and
+        whitespace) is still being processed waits for that result instead of
+        being processed again.
+        
         Args:
             command: Command text
             
@@ -178,7 +212,45 @@ class MicroservicesControlPlane:
         if not self.command_processor:
             return "Command processor is not available"
             
-        return self.command_processor.process_command(command)
+        key = " ".join(command.lower().split())
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+                
+        if not leader:
+            return future.result()
+            
+        try:
+            response = self.command_processor.process_command(command)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(response)
+        finally:
+            with self._inflight_lock:
+                del self._inflight[key]
+                
+        return response
+        
+    def submit_command(self, command: str) -> Future:
+        """
+        Process a command on the MCP worker threads without blocking the caller.
+        
+        Args:
+            command: Command text
+            
+        Returns:
+            Future resolving to the response text
+        """
+        if not self.executor:
+            future = Future()
+            future.set_result(self.process_command(command))
+            return future
+            
+        return self.executor.submit(self.process_command, command)
         
     def _signal_handler(self, sig, frame):
         """Handle signals for graceful shutdown."""
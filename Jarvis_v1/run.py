@@ -1,7 +1,7 @@
 import os
 import sys
-import time
 import signal
+import threading
 from loguru import logger
 
 from mcp.controller import MicroservicesControlPlane
@@ -13,8 +13,9 @@ def main():
     # Configure logger
     log_level = settings.general.log_level
     logger.remove()
-    logger.add(sys.stderr, level=log_level)
-    logger.add(f"logs/local-ai-assistant.log", rotation="10 MB", level=log_level)
+    # Sinks write from a background thread so logging never blocks callers
+    logger.add(sys.stderr, level=log_level, enqueue=True)
+    logger.add(f"logs/local-ai-assistant.log", rotation="10 MB", level=log_level, enqueue=True)
     
     # Create logs directory if it doesn't exist
     os.makedirs("logs", exist_ok=True)
@@ -34,19 +35,22 @@ def main():
     logger.info("Local AI Assistant started successfully")
     
     # Set up signal handler for graceful shutdown
+    shutdown_event = threading.Event()
+    
     def signal_handler(sig, frame):
         logger.info(f"Received signal {sig}, shutting down...")
         mcp.stop()
         logger.info("Local AI Assistant stopped")
-        sys.exit(0)
+        shutdown_event.set()
         
     signal.signal(signal.SIGINT, signal_handler)
     signal.signal(signal.SIGTERM, signal_handler)
     
-    # Keep running until interrupted
+    # Sleep until a signal arrives; Windows only delivers Ctrl+C to a timed wait
+    wait_timeout = None if os.name == "posix" else 1.0
     try:
-        while True:
-            time.sleep(1.0)
+        while not shutdown_event.wait(wait_timeout):
+            pass
     except KeyboardInterrupt:
         logger.info("Received keyboard interrupt, shutting down...")
         mcp.stop()
@@ -9,10 +9,14 @@ setup(
     install_requires=[
         "fastapi>=0.104.1",
         "uvicorn>=0.24.0",
-        "typer>=0.9.0",
+        "uvloop>=0.19.0; sys_platform != 'win32'",
+        "httptools>=0.6.1",
         "pydantic>=2.4.2",
+        "orjson>=3.9.10",
+        "msgspec>=0.18.4",
         "python-dotenv>=1.0.0",
         "requests>=2.31.0",
+        "httpx[http2]>=0.25.2",
         "loguru>=0.7.2",
         "apscheduler>=3.10.4",
         "websockets>=12.0",
@@ -35,9 +39,13 @@ setup(
         "pycec>=0.5.1",
         "docker>=6.1.3"
     ],
+    extras_require={
+        "faster-whisper": ["faster-whisper>=0.10.0"],
+        "numba": ["numba>=0.58.1"],
+    },
     entry_points={
         "console_scripts": [
-            "local-ai-assistant=cli:app",
+            "local-ai-assistant=cli:main",
         ],
     },
     python_requires=">=3.8",